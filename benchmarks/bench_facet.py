@@ -0,0 +1,59 @@
+"""Compare `facet()` with building a trace per group of `df.groupby()` and calling
+`figure_mult()`.
+
+usage: python benchmarks/bench_facet.py [-n N_ROWS] [-g N_GROUPS] [--kind KIND]
+"""
+
+import argparse
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+import plotly_light as pl
+from plotly_light._show import figure_mult
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--n-rows", type=int, default=1_000_000)
+    parser.add_argument("-g", "--n-groups", type=int, default=100)
+    parser.add_argument("--kind", choices=["scatter", "hist"], default="scatter")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        dict(
+            x=rng.random(args.n_rows),
+            y=rng.random(args.n_rows),
+            g=rng.integers(0, args.n_groups, args.n_rows),
+        )
+    )
+    n_col = int(np.ceil(np.sqrt(args.n_groups)))
+    grid_args = dict(
+        n_col=n_col,
+        horizontal_spacing=0.2 / n_col,
+        vertical_spacing=0.2 / n_col,
+        shared_xaxes="all",
+        shared_yaxes="all",
+    )
+
+    t = perf_counter()
+    figs = []
+    for g, sub in df.groupby("g"):
+        trace = (
+            pl.scatter(list(sub["x"]), list(sub["y"]))
+            if args.kind == "scatter"
+            else pl.hist(list(sub["x"]))
+        )
+        figs.append(pl.figure(trace, pl.layout(title=str(g))))
+    figure_mult(figs, **grid_args)
+    print(f"groupby loop: {perf_counter() - t:7.2f} sec")
+
+    t = perf_counter()
+    pl.facet(df, x="x", y="y", by="g", kind=args.kind, **grid_args)
+    print(f"facet       : {perf_counter() - t:7.2f} sec")
+
+
+if __name__ == "__main__":
+    main()
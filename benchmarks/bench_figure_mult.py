@@ -0,0 +1,50 @@
+"""Measure the time of `figure_mult()` for grids of many small subplots.
+
+usage: python benchmarks/bench_figure_mult.py [-n N_SUBPLOTS ...] [--raw]
+"""
+
+import argparse
+from time import perf_counter
+
+import numpy as np
+
+import plotly_light as pl
+from plotly_light._show import figure_mult
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-n", "--n-subplots", type=int, nargs="+", default=[100, 400, 1000]
+    )
+    parser.add_argument("--n-points", type=int, default=100)
+    parser.add_argument(
+        "--raw", action="store_true", help="Set default.validate = False"
+    )
+    args = parser.parse_args()
+
+    pl.default.validate = not args.raw
+    rng = np.random.default_rng(0)
+    for n in args.n_subplots:
+        n_col = int(np.ceil(np.sqrt(n)))
+        figs = [
+            pl.figure(
+                pl.scatter(rng.random(args.n_points), rng.random(args.n_points)),
+                pl.layout(title=f"#{i}", x_range=(0, 1), y_range=(0, 1)),
+            )
+            for i in range(n)
+        ]
+        t = perf_counter()
+        figure_mult(
+            figs,
+            n_col=n_col,
+            horizontal_spacing=0.2 / n_col,
+            vertical_spacing=0.2 / n_col,
+            shared_xaxes=True,
+            shared_yaxes=True,
+        )
+        print(f"{n:5d} subplots ({n_col} cols): {perf_counter() - t:7.2f} sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Measure the time of `import plotly_light` in fresh interpreters.
+
+usage: python benchmarks/bench_import.py [-n N_RUNS] [--max SECONDS] [--heavy]
+
+Exits with status 1 if the median time exceeds `--max`, so that it can be used to
+catch regressions in CI. With `--heavy`, also report which heavy packages are
+imported only by `import plotly_light`.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+HEAVY_MODULES = ["pandas", "matplotlib", "matplotlib_venn", "scipy"]
+
+_TIME_CODE = """\
+import time
+t = time.perf_counter()
+import plotly_light
+print(time.perf_counter() - t)
+"""
+
+_HEAVY_CODE = f"""\
+import sys
+import plotly_light
+print(",".join(m for m in {HEAVY_MODULES!r} if m in sys.modules))
+"""
+
+
+def _run(code: str) -> str:
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        check=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    ).stdout.strip()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--n-runs", type=int, default=10)
+    parser.add_argument("--max", type=float, default=None)
+    parser.add_argument("--heavy", action="store_true")
+    args = parser.parse_args()
+
+    # The first run is discarded as it includes compiling .pyc files
+    _run(_TIME_CODE)
+    times = [float(_run(_TIME_CODE)) for _ in range(args.n_runs)]
+    median = statistics.median(times)
+    print(
+        f"import plotly_light: median {median:.3f} sec, "
+        f"min {min(times):.3f} sec, max {max(times):.3f} sec ({args.n_runs} runs)"
+    )
+    if args.heavy:
+        print(f"heavy modules imported: {_run(_HEAVY_CODE) or 'none'}")
+    if args.max is not None and median > args.max:
+        print(f"median exceeds {args.max:.3f} sec", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Compare the size and time of HTML files of figures written with and without
+typed arrays (`default.typed_arrays`).
+
+usage: python benchmarks/bench_serialize.py [-n N_POINTS] [-r N_REPEATS]
+"""
+
+import argparse
+import os
+import tempfile
+from time import perf_counter
+
+import numpy as np
+import plotly.io as pio
+
+import plotly_light as pl
+from plotly_light._json import encode_typed_arrays
+
+
+def _write_html(fig_dict, fname: str) -> None:
+    pio.write_html(
+        encode_typed_arrays(fig_dict), fname, include_plotlyjs=False, validate=False
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--n-points", type=int, default=1_000_000)
+    parser.add_argument("-r", "--n-repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    x = np.arange(args.n_points)
+    y = rng.normal(size=args.n_points)
+    figs = {
+        "ndarray": pl.figure(pl.scatter(x, y, use_webgl=True)).to_plotly_json(),
+        "list": pl.figure(
+            pl.scatter(x.tolist(), y.tolist(), use_webgl=True)
+        ).to_plotly_json(),
+    }
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, fig_dict in figs.items():
+            for typed_arrays in (False, True):
+                pl.default.typed_arrays = typed_arrays
+                times = []
+                for i in range(args.n_repeats):
+                    # New file each time not to measure the truncation of a file
+                    fname = os.path.join(tmp_dir, f"{name}_{typed_arrays}_{i}.html")
+                    t = perf_counter()
+                    _write_html(fig_dict, fname)
+                    times.append(perf_counter() - t)
+                print(
+                    f"{name:>7} data, typed_arrays={typed_arrays!s:>5}: "
+                    f"{os.path.getsize(fname) / 1e6:7.2f} MB, "
+                    f"{min(times) * 1000:8.1f} ms"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,9 @@
+from importlib import import_module as _import_module
+
 from logzero import logger as _logger
 
 from . import default
 from ._bar import bar
-from ._box import box, violin
 from ._config import (
     set_default_colors,
     set_default_config,
@@ -14,20 +15,78 @@ from ._config import (
 )
 from ._const import IFRAME_DIR, colors
 from ._crawl import _remove_unused_htmls
-from ._histogram import hist
-from ._image import image, show_image
+from ._export import export_many
 from ._layout import layout, merge_layout
 from ._line import lines, lines_shape
 from ._rectangle import closures, rects, rects_shape
-from ._renderer import _set_custom_iframe_renderers
+from ._renderer import _set_custom_iframe_renderers, flush_html_writes
 from ._scatter import scatter
 from ._show import figure, show, show_mult
 from ._type import BaseTraceType, Traces
-from ._venn import venn
+
+# Functions in submodules depending on heavy packages (e.g. pandas, PIL, matplotlib),
+# which are imported when first accessed
+_LAZY_ATTRS = {
+    "box": "._box",
+    "violin": "._box",
+    "density": "._density",
+    "facet": "._facet",
+    "gc_htmls": "._gc",
+    "HistAccumulator": "._histogram",
+    "hist": "._histogram",
+    "hist_many": "._histogram",
+    "image": "._image",
+    "show_image": "._image",
+    "venn": "._venn",
+}
+
+__all__ = [
+    "default",
+    "bar",
+    "set_default_colors",
+    "set_default_config",
+    "set_default_layout",
+    "set_default_renderer",
+    "set_default_theme",
+    "update_default_config",
+    "update_default_layout",
+    "IFRAME_DIR",
+    "colors",
+    "export_many",
+    "layout",
+    "merge_layout",
+    "lines",
+    "lines_shape",
+    "closures",
+    "rects",
+    "rects_shape",
+    "flush_html_writes",
+    "scatter",
+    "figure",
+    "show",
+    "show_mult",
+    "BaseTraceType",
+    "Traces",
+    *_LAZY_ATTRS,
+]
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_ATTRS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(_import_module(_LAZY_ATTRS[name], __name__), name)
+    # Cache in the module so that `__getattr__` is not called again
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRS))
+
 
 # Set default theme/layout/config of Plotly Light
+# (The default layout is merged into the theme by `set_default_theme`)
 set_default_theme(default.theme)
-set_default_layout(default.layout)
 set_default_config(default.config)
 
 
@@ -55,7 +114,8 @@ else:
             _logger.info(f"plotly_light: failed _set_custom_iframe_renderers()\n{e}")
         else:
             set_default_renderer("iframe_connected")
-            _remove_unused_htmls()
+            # Not to block the import with notebooks scanned
+            _remove_unused_htmls(background=True)
     else:
         _logger.info(f"plotly_light: in unknown environment ({env_name})")
 
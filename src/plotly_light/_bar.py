@@ -2,6 +2,8 @@ from typing import Optional, Sequence
 
 import plotly.graph_objects as go
 
+from ._trace import make_trace
+
 
 def bar(
     x: Sequence,
@@ -30,7 +32,8 @@ def bar(
       @ show_legend : Show this trace in legend.
       @ show_init   : Show this trace initially.
     """
-    return go.Bar(
+    return make_trace(
+        go.Bar,
         x=x,
         y=y,
         text=text,
@@ -1,8 +1,61 @@
-from typing import Any, List, Optional, Sequence, Tuple, Union
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
+import numpy as np
 import plotly.graph_objects as go
 
 from . import default
+from ._trace import make_trace
+
+
+def _sample(data: np.ndarray, n: int) -> np.ndarray:
+    """Randomly (but reproducibly) sample at most `n` values."""
+    if len(data) <= n:
+        return data
+    return np.sort(np.random.default_rng(0).choice(data, n, replace=False))
+
+
+def _as_1d_array(data: Sequence[Any]) -> np.ndarray:
+    """Convert data into a 1-D float array for precomputed statistics."""
+    try:
+        arr = np.asarray(data, dtype=float)
+    except ValueError:  # ragged or not numerical
+        arr = None
+    assert (
+        arr is not None and arr.ndim == 1
+    ), "`data` must be a 1-D sequence of numbers if `precompute`"
+    return arr
+
+
+def _box_stats(data: Sequence[Any], max_n_points: int, all_points: bool) -> Dict:
+    """Compute the statistics drawn in a box plot in the same way as plotly.js."""
+    data = np.asarray(data, dtype=float)
+    data = data[~np.isnan(data)]
+    q1, median, q3 = np.percentile(data, [25, 50, 75])
+    iqr = q3 - q1
+    lowerfence = data[data >= q1 - 1.5 * iqr].min()
+    upperfence = data[data <= q3 + 1.5 * iqr].max()
+    points = data if all_points else data[(data < lowerfence) | (data > upperfence)]
+    return dict(
+        q1=[q1],
+        median=[median],
+        q3=[q3],
+        lowerfence=[lowerfence],
+        upperfence=[upperfence],
+        mean=[data.mean()],
+        sd=[data.std()],
+        points=[_sample(points, max_n_points)],
+    )
+
+
+def _violin_summary(data: Sequence[Any], n_quantiles: int) -> Tuple[np.ndarray, float]:
+    """Summarize the distribution with equally spaced quantiles (including min and
+    max), and compute the KDE bandwidth for the entire data in the same way as plotly.js.
+    """
+    data = np.asarray(data, dtype=float)
+    data = data[~np.isnan(data)]
+    q1, q3 = np.percentile(data, [25, 75])
+    bandwidth = 1.059 * min(data.std(ddof=1), (q3 - q1) / 1.349) * len(data) ** (-1 / 5)
+    return np.quantile(data, np.linspace(0, 1, n_quantiles)), bandwidth or None
 
 
 def box(
@@ -17,6 +70,8 @@ def box(
     horizontal: bool = False,
     show_legend: bool = False,
     show_init: bool = True,
+    precompute: bool = False,
+    max_n_points: int = 1000,
 ) -> go.Box:
     """Create a simple Trace object of a box plot.
 
@@ -24,17 +79,34 @@ def box(
       @ data : Sequence (of sequence(s)) of data values.
 
     optional arguments:
-      @ name        : Display name of the trace in legend and plot.
-      @ col         : Color of the plot.
-      @ opacity     : Opacity of the plot.
-      @ show_points : Plot markers as well as the box.
-      @ only_points : Plot only markers and hide the box.
-      @ show_legend : Show this trace in legend.
-      @ show_init   : Show this trace initially.
+      @ name         : Display name of the trace in legend and plot.
+      @ col          : Color of the plot.
+      @ opacity      : Opacity of the plot.
+      @ show_points  : Plot markers as well as the box.
+      @ only_points  : Plot only markers and hide the box.
+      @ show_legend  : Show this trace in legend.
+      @ show_init    : Show this trace initially.
+      @ precompute   : If True, compute the quartiles, fences, mean and outliers
+                       of a single sequence of data in Python and send only them
+                       instead of the raw data. Use this for large datasets.
+      @ max_n_points : Maximum number of markers (outliers, or all data if
+                       `show_points`) randomly sampled if `precompute`.
     """
-    return go.Box(
-        x=data if horizontal else None,
-        y=data if not horizontal else None,
+    # Positions of the box, and the box statistics if precomputed
+    pos, stats = None, {}
+    if precompute:
+        assert text is None, "`text` is not supported if `precompute`"
+        data = _as_1d_array(data)
+        stats = _box_stats(data, max_n_points, show_points or only_points)
+        # Sampled points of each box
+        data = stats.pop("points")
+        if name is not None:
+            pos = [name]
+    return make_trace(
+        go.Box,
+        x=data if horizontal else pos,
+        y=data if not horizontal else pos,
+        **stats,
         text=text,
         orientation="h" if horizontal else None,
         boxpoints="all" if show_points or only_points else None,
@@ -68,6 +140,8 @@ def violin(
     horizontal: bool = False,
     show_legend: bool = False,
     show_init: bool = True,
+    precompute: bool = False,
+    max_n_points: int = 1000,
 ) -> go.Box:
     """Create a simple Trace object of a box plot.
 
@@ -75,28 +149,40 @@ def violin(
       @ data : Sequence (of sequence(s)) of data values.
 
     optional arguments:
-      @ name        : Display name of the trace in legend and plot.
-      @ col         : Color of the plot.
-      @ opacity     : Opacity of the plot.
-      @ side        : Must be one of {None, "positive", "negative"}.
-      @ show_box    : Show the box plot.
-      @ show_points : Plot markers as well as the box.
-      @ show_legend : Show this trace in legend.
-      @ show_init   : Show this trace initially.
+      @ name         : Display name of the trace in legend and plot.
+      @ col          : Color of the plot.
+      @ opacity      : Opacity of the plot.
+      @ side         : Must be one of {None, "positive", "negative"}.
+      @ show_box     : Show the box plot.
+      @ show_points  : Plot markers as well as the box.
+      @ show_legend  : Show this trace in legend.
+      @ show_init    : Show this trace initially.
+      @ precompute   : If True, send only `max_n_points` equally spaced quantiles
+                       (including min and max) of a single sequence of data
+                       instead of the raw data, with the KDE bandwidth computed
+                       for the raw data. Use this for large datasets.
+                       The points drawn by `show_points` are these quantiles.
+      @ max_n_points : Number of quantiles if `precompute`.
     """
     if side == "positive" and pointpos is None:
         pointpos = 1
-    return go.Violin(
+    bandwidth = None
+    if precompute:
+        assert text is None, "`text` is not supported if `precompute`"
+        data, bandwidth = _violin_summary(_as_1d_array(data), max_n_points)
+    return make_trace(
+        go.Violin,
         x=data if horizontal else None,
         y=data if not horizontal else None,
         text=text,
         orientation="h" if horizontal else None,
-        box_visible=show_box,
+        box=dict(visible=show_box),
         points="all" if show_points else None,
         marker={"color": col},
         opacity=opacity,
         side=side,
         pointpos=pointpos,
+        bandwidth=bandwidth,
         name=name,
         showlegend=show_legend,
         visible=None if show_init else "legendonly",
@@ -0,0 +1,30 @@
+import os
+
+from plotly.offline import get_plotlyjs, get_plotlyjs_version
+
+from . import default
+from ._file import atomic_path
+
+
+def write_plotlyjs(directory: str) -> str:
+    """Write plotly.js into `directory` unless it already exists there, and return
+    the file path. The file name contains the version of plotly.js.
+    """
+    fname = os.path.join(directory, f"plotly-{get_plotlyjs_version()}.min.js")
+    if not os.path.isfile(fname):
+        os.makedirs(directory, exist_ok=True)
+        # Write via a temporary file so that a partial file is never loaded
+        with atomic_path(fname) as tmp_fname:
+            with open(tmp_fname, "w", encoding="utf-8") as f:
+                f.write(get_plotlyjs())
+    return fname
+
+
+def shared_plotlyjs_src(html_directory: str) -> str:
+    """Write plotly.js shared by HTML files in `html_directory` (or in
+    `default.plotlyjs_dir` if set), and return its path relative to `html_directory`.
+    """
+    fname = write_plotlyjs(
+        html_directory if default.plotlyjs_dir is None else default.plotlyjs_dir
+    )
+    return os.path.relpath(fname, html_directory)
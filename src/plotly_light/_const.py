@@ -29,3 +29,7 @@ colors = {
 
 # temporary directory for storing HTML plot files
 IFRAME_DIR = "iframe_figures"
+
+# ID of the invisible axes with a fixed range [0, 1] overlaying the main axes,
+# on which traces of shapes with `[x|y]ref="paper"` are drawn
+PAPER_AXIS_ID = 99
@@ -1,39 +1,98 @@
 import glob
 import json
+import os
+import re
+import threading
+import time
 from os import remove
-from typing import List
+from typing import Dict, List
 
 from ._const import IFRAME_DIR
+from ._file import atomic_path
+
+# Cache of the plotly HTML file names in each notebook
+MANIFEST_FNAME = f"{IFRAME_DIR}/.manifest.json"
+
+_HTML_PATTERN = re.compile(rf'src=\\"({re.escape(IFRAME_DIR)}/[^"\\]+\.html)\\"')
 
 
 def _get_html_list_jupyter(fname: str) -> List[str]:
-    """Get the list of plotly HTML file names in a jupyter notebook."""
-    data = json.load(open(fname, "r"))
+    """Get the list of plotly HTML file names in a jupyter notebook.
+    The notebook is scanned line by line as a text without being parsed as JSON.
+    """
     plotly_htmls = []
-    if "cells" in data:
-        for cell in data["cells"]:
-            if "outputs" not in cell:
-                continue
-            for output in cell["outputs"]:
-                if "data" in output and "text/html" in output["data"]:
-                    for html in output["data"]["text/html"]:
-                        if html.startswith(f'src="{IFRAME_DIR}/') and html.endswith(
-                            '.html"\n'
-                        ):
-                            plotly_htmls.append(html.split('"')[1].strip())
+    with open(fname, "r", encoding="utf-8") as f:
+        for line in f:
+            if IFRAME_DIR in line:
+                plotly_htmls += _HTML_PATTERN.findall(line)
     return plotly_htmls
 
 
-def _remove_unused_htmls() -> None:
-    """Remove plot HTML files that are no longer used in the Notebook currently opened."""
+def _load_manifest() -> Dict[str, Dict]:
+    try:
+        with open(MANIFEST_FNAME, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_manifest(manifest: Dict[str, Dict]) -> None:
+    if not os.path.isdir(IFRAME_DIR):
+        return
+    with atomic_path(MANIFEST_FNAME) as tmp_fname, open(tmp_fname, "w") as f:
+        json.dump(manifest, f)
+
 
+def _get_html_list_jupyter_cached(
+    fname: str, old_manifest: Dict[str, Dict], new_manifest: Dict[str, Dict]
+) -> List[str]:
+    """Same as `_get_html_list_jupyter`, but the result is reused from the manifest
+    if the mtime and size of the notebook are not changed.
+    """
+    stat = os.stat(fname)
+    entry = old_manifest.get(fname)
+    if (
+        entry is None
+        or entry["mtime"] != stat.st_mtime
+        or entry["size"] != stat.st_size
+    ):
+        entry = dict(
+            mtime=stat.st_mtime,
+            size=stat.st_size,
+            htmls=_get_html_list_jupyter(fname),
+        )
+    new_manifest[fname] = entry
+    return entry["htmls"]
+
+
+def _remove_unused_htmls_sync() -> None:
+    # HTML files created after this are not removed, since they might be
+    # plots drawn after this function is called and not saved in notebooks yet
+    start_time = time.time()
+    old_manifest, new_manifest = _load_manifest(), {}
     htmls_jupyter = set(
         [
             x
             for ipynb_file in glob.glob("*.ipynb")
-            for x in _get_html_list_jupyter(ipynb_file)
+            for x in _get_html_list_jupyter_cached(
+                ipynb_file, old_manifest, new_manifest
+            )
         ]
     )
     for html in glob.glob(f"{IFRAME_DIR}/*.html"):
-        if html not in htmls_jupyter:
+        if html not in htmls_jupyter and os.path.getmtime(html) < start_time:
             remove(html)
+    if new_manifest != old_manifest:
+        _save_manifest(new_manifest)
+
+
+def _remove_unused_htmls(background: bool = False) -> None:
+    """Remove plot HTML files that are no longer used in the Notebook currently opened.
+
+    optional arguments:
+      @ background : If True, run in a background thread.
+    """
+    if background:
+        threading.Thread(target=_remove_unused_htmls_sync, daemon=True).start()
+    else:
+        _remove_unused_htmls_sync()
@@ -0,0 +1,102 @@
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+import plotly.graph_objects as go
+
+from . import default
+from ._trace import make_trace
+
+
+def density(
+    x: Sequence,
+    y: Sequence,
+    bin_num: Optional[Union[int, Tuple[int, int]]] = None,
+    x_range: Optional[Tuple[float, float]] = None,
+    y_range: Optional[Tuple[float, float]] = None,
+    log_scale: bool = False,
+    col_scale: Optional[str] = None,
+    reverse_scale: bool = False,
+    show_col_bar: bool = False,
+    col_bar_title: Optional[str] = None,
+    opacity: Optional[float] = None,
+    name: Optional[str] = None,
+    show_legend: bool = False,
+    show_init: bool = True,
+) -> go.Heatmap:
+    """Create a Trace object of a rasterized density plot (i.e. 2D histogram)
+    of a huge point cloud. The points are binned into a pixel grid in Python, so
+    the size of the plot depends only on the number of bins, not on the data size.
+
+    positional arguments:
+      @ x : Coordinates of data on x-axis.
+      @ y : Coordinates of data on y-axis.
+
+    optional arguments:
+      @ bin_num       : Number of bins in x/y-axis. An integer or a tuple of (x, y).
+                        Default: `default.plot_size` (i.e. one bin per pixel).
+      @ [x|y]_range   : Range of data on [x|y]-axis to be binned.
+                        Default: (min, max) of the data.
+      @ log_scale     : Show log10 of the counts as colors.
+      @ col_scale     : Color scale for the counts.
+      @ reverse_scale : Reverse `col_scale`.
+      @ show_col_bar  : Show a color scale bar.
+      @ col_bar_title : Title text of the color scale bar.
+      @ opacity       : Opacity of the trace.
+      @ name          : Display name of the trace in legend.
+      @ show_legend   : Show this trace in legend.
+      @ show_init     : Show this trace initially.
+    """
+    assert len(x) == len(y), "`x` and `y` must have same size"
+    if bin_num is None:
+        bin_num = default.plot_size
+    nx, ny = (bin_num, bin_num) if isinstance(bin_num, int) else bin_num
+    x, y = np.asarray(x), np.asarray(y)
+    xb, xe = (np.nanmin(x), np.nanmax(x)) if x_range is None else x_range
+    yb, ye = (np.nanmin(y), np.nanmax(y)) if y_range is None else y_range
+    # A range of zero width is widened around the value
+    if not xe > xb:
+        xb, xe = xb - 0.5, xe + 0.5
+    if not ye > yb:
+        yb, ye = yb - 0.5, ye + 0.5
+    x_size, y_size = (xe - xb) / nx, (ye - yb) / ny
+
+    # Bin the points with `np.bincount` on flattened pixel indices
+    ix = np.floor((x - xb) / x_size)
+    iy = np.floor((y - yb) / y_size)
+    # Points exactly on the upper bounds are included in the last bins
+    ix[x == xe] = nx - 1
+    iy[y == ye] = ny - 1
+    is_in = (ix >= 0) & (ix < nx) & (iy >= 0) & (iy < ny)
+    counts = np.bincount(
+        iy[is_in].astype(np.int64) * nx + ix[is_in].astype(np.int64),
+        minlength=nx * ny,
+    ).reshape(ny, nx)
+
+    z = counts.astype(float)
+    # Empty pixels are transparent
+    z[counts == 0] = np.nan
+    if log_scale:
+        z = np.log10(z)
+
+    return make_trace(
+        go.Heatmap,
+        z=z,
+        x0=xb + x_size / 2,
+        dx=x_size,
+        y0=yb + y_size / 2,
+        dy=y_size,
+        customdata=counts if log_scale else None,
+        hovertemplate=(
+            "x=%{x}<br>y=%{y}<br>count="
+            + ("%{customdata}" if log_scale else "%{z}")
+            + "<extra></extra>"
+        ),
+        colorscale=col_scale,
+        reversescale=reverse_scale,
+        showscale=show_col_bar,
+        colorbar=dict(title=dict(text=col_bar_title)),
+        opacity=opacity,
+        name=name,
+        showlegend=show_legend,
+        visible=None if show_init else "legendonly",
+    )
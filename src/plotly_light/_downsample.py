@@ -0,0 +1,120 @@
+from typing import Sequence
+
+import numpy as np
+
+from . import default
+
+
+def _to_numeric(x: Sequence) -> np.ndarray:
+    """Convert `x` into a numerical array. Datetimes are converted into integers."""
+    x = np.asarray(x)
+    if x.dtype.kind in "mM":
+        x = x.astype("int64")
+    assert x.dtype.kind in "iuf", "Only numerical or datetime data can be downsampled"
+    return x
+
+
+def _extrema(y: np.ndarray) -> np.ndarray:
+    """Indices of the global minimum and maximum values of `y` (ignoring NaN)."""
+    if np.all(np.isnan(y)):
+        return np.array([], dtype=int)
+    return np.array([np.nanargmin(y), np.nanargmax(y)])
+
+
+def _uniform(x: np.ndarray, y: np.ndarray, width: int) -> np.ndarray:
+    """Pick equally spaced points (plus the global extrema)."""
+    n_out = width * default.downsample_points_per_px
+    return np.union1d(
+        np.linspace(0, len(x) - 1, n_out).round().astype(int), _extrema(y)
+    )
+
+
+def _minmax(x: np.ndarray, y: np.ndarray, width: int) -> np.ndarray:
+    """M4 downsampling: for each pixel column along the x-axis, keep the first,
+    last, minimum and maximum points. `x` must be sorted.
+    """
+    n_col = max(width, 1)
+    x0, x1 = x[0], x[-1]
+    if x0 == x1:
+        col_ids = np.zeros(len(x), dtype=int)
+    else:
+        col_ids = np.minimum(((x - x0) / (x1 - x0) * n_col).astype(int), n_col - 1)
+    # Columns are contiguous because `x` is sorted
+    starts = np.flatnonzero(np.r_[True, col_ids[1:] != col_ids[:-1]])
+    ends = np.r_[starts[1:], len(x)] - 1
+    counts = ends - starts + 1
+    group_ids = np.repeat(np.arange(len(starts)), counts)
+
+    _y = np.where(np.isnan(y), np.inf, y)
+    mins = np.minimum.reduceat(_y, starts)
+    argmins = np.flatnonzero(_y == np.repeat(mins, counts))
+    argmins = argmins[np.unique(group_ids[argmins], return_index=True)[1]]
+
+    _y = np.where(np.isnan(y), -np.inf, y)
+    maxs = np.maximum.reduceat(_y, starts)
+    argmaxs = np.flatnonzero(_y == np.repeat(maxs, counts))
+    argmaxs = argmaxs[np.unique(group_ids[argmaxs], return_index=True)[1]]
+
+    return np.unique(np.concatenate([starts, ends, argmins, argmaxs]))
+
+
+def _lttb(x: np.ndarray, y: np.ndarray, width: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets downsampling (plus the global extrema).
+    `x` must be sorted. The loop runs over buckets (i.e. about the number of
+    pixels), and the points inside each bucket are processed at once.
+    """
+    n = len(x)
+    n_out = width * default.downsample_points_per_px
+    if n_out < 3:
+        return _uniform(x, y, width)
+    x = x.astype(float)
+    y = np.nan_to_num(y.astype(float))
+    bounds = np.linspace(1, n - 1, n_out - 1).astype(int)
+    # Average point of the next bucket for each bucket
+    sizes = np.maximum(np.diff(bounds), 1)
+    avg_x = np.r_[(np.add.reduceat(x[:-1], bounds[:-1]) / sizes)[1:], x[-1]]
+    avg_y = np.r_[(np.add.reduceat(y[:-1], bounds[:-1]) / sizes)[1:], y[-1]]
+
+    indices = np.empty(n_out, dtype=int)
+    indices[0] = a = 0
+    for i in range(n_out - 2):
+        b, e = bounds[i], bounds[i + 1]
+        if b == e:
+            indices[i + 1] = a
+            continue
+        areas = np.abs(
+            (x[a] - avg_x[i]) * (y[b:e] - y[a]) - (x[a] - x[b:e]) * (avg_y[i] - y[a])
+        )
+        indices[i + 1] = a = b + int(np.argmax(areas))
+    indices[-1] = n - 1
+    return np.union1d(indices, _extrema(y))
+
+
+_METHODS = {"lttb": _lttb, "minmax": _minmax, "uniform": _uniform}
+
+
+def downsample_indices(x: Sequence, y: Sequence, method: str, width: int) -> np.ndarray:
+    """Return indices (in the order of `x`) of the data points to be kept after
+    downsampling the data for a plot of `width` pixels. Global extrema are always kept.
+
+    positional arguments:
+      @ x      : Coordinates of data on x-axis.
+      @ y      : Coordinates of data on y-axis.
+      @ method : Must be one of {"lttb", "minmax", "uniform"}.
+                   - "lttb"    : Largest-Triangle-Three-Buckets.
+                   - "minmax"  : First/last/min/max points in each pixel column (M4).
+                   - "uniform" : Equally spaced points.
+      @ width  : Width of the plot in pixels.
+    """
+    assert method in _METHODS, f"`downsample` must be one of {set(_METHODS)}"
+    x, y = _to_numeric(x), _to_numeric(y)
+    # Not downsampled if not more than the points kept by any method
+    if len(x) <= width * max(4, default.downsample_points_per_px):
+        return np.arange(len(x))
+    # Sort by x if not sorted (e.g. non time-series data)
+    order = None
+    if np.any(x[1:] < x[:-1]):
+        order = np.argsort(x, kind="stable")
+        x, y = x[order], y[order]
+    indices = _METHODS[method](x, y, width)
+    return indices if order is None else order[indices]
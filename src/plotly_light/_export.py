@@ -0,0 +1,284 @@
+import glob
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import sha256
+from math import sqrt
+from time import perf_counter
+from typing import Dict, List, Optional, Sequence, Union
+
+import plotly
+import plotly.graph_objects as go
+import plotly.io as pio
+from logzero import logger
+
+from . import default
+from ._bundle import shared_plotlyjs_src
+from ._file import atomic_path
+from ._json import encode_typed_arrays, fig_to_json
+
+# Worker processes kept alive across `export_many()` calls, so that each of them
+# reuses its own Kaleido (Chromium) process
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_size = 0
+
+
+def _expand_out_image(out_image: str) -> List[str]:
+    """Expand e.g. `out.{svg,pdf}` into [`out.svg`, `out.pdf`]."""
+    if out_image.endswith("}"):  # multiple output formats
+        data = out_image[:-1].split("{")
+        assert len(data) == 2, f"Invalid format: {out_image}"
+        prefix = data[0]
+        exts = data[1].split(",")
+        return [f"{prefix}{ext}" for ext in exts]
+    else:  # single output formats
+        return [out_image]
+
+
+def _export_scale(fig_dict: Dict) -> float:
+    """Scale factor to achieve the default dpi for the size of plot_inch."""
+    width = fig_dict.get("layout", {}).get("width")
+    height = fig_dict.get("layout", {}).get("height")
+    assert (
+        width is not None and height is not None
+    ), "width and height must be set to output images"
+    return sqrt(((default.dpi * default.plot_inch) ** 2) / (width * height))
+
+
+def _evict_cache(cache_dir: str, max_size: int) -> None:
+    """Remove least recently used files in the cache until the total size is
+    at most `max_size` bytes.
+    """
+    entries = []
+    for fname in glob.glob(os.path.join(cache_dir, "*")):
+        try:
+            stat = os.stat(fname)
+        except FileNotFoundError:  # removed by another process
+            continue
+        entries.append((stat.st_mtime, stat.st_size, fname))
+    total_size = sum(size for _, size, _ in entries)
+    for _, size, fname in sorted(entries):
+        if total_size <= max_size:
+            break
+        try:
+            os.remove(fname)
+        except FileNotFoundError:
+            pass
+        total_size -= size
+
+
+def _write_image_cached(
+    fig_dict: Dict,
+    fig_hash: Optional[str],
+    out_fname: str,
+    scale: float,
+    cache_dir: Optional[str],
+    cache_size: int,
+) -> None:
+    """Write an image file, reusing the cached one for the same figure, scale and
+    format if `cache_dir` is not None.
+    """
+    if cache_dir is None:
+        pio.write_image(fig_dict, out_fname, scale=scale, validate=False)
+        return
+
+    ext = os.path.splitext(out_fname)[1]
+    key = sha256(f"{fig_hash}:{scale!r}:{ext}".encode()).hexdigest()
+    cache_fname = os.path.join(cache_dir, f"{key}{ext}")
+    if os.path.isfile(cache_fname):
+        # Mark as recently used
+        os.utime(cache_fname)
+        shutil.copyfile(cache_fname, out_fname)
+        return
+
+    pio.write_image(fig_dict, out_fname, scale=scale, validate=False)
+    os.makedirs(cache_dir, exist_ok=True)
+    # Copy via a temporary file so that other processes never see a partial file
+    with atomic_path(cache_fname) as tmp_fname:
+        shutil.copyfile(out_fname, tmp_fname)
+    _evict_cache(cache_dir, cache_size)
+
+
+# Whether the current process is a worker of `_pool`, and whether its Kaleido server
+# has been started (only when an image is first written, not for HTML files)
+_is_worker = False
+_kaleido_started = False
+
+
+def _init_worker() -> None:
+    global _is_worker
+    _is_worker = True
+
+
+def _start_kaleido_server() -> None:
+    """Start a persistent Kaleido server in a worker process if supported."""
+    global _kaleido_started
+    if not _is_worker or _kaleido_started:
+        return
+    _kaleido_started = True
+    try:
+        import kaleido
+
+        kaleido.start_sync_server(silence_warnings=True)
+    except Exception:
+        # Kaleido < 1.0 keeps its own process alive by itself
+        pass
+
+
+def _export(
+    fig_dict: Dict,
+    out_fnames: Sequence[str],
+    config: Optional[Dict],
+    include_plotlyjss: Sequence[Union[bool, str, None]],
+    scale: Optional[float],
+    typed_arrays: bool,
+    typed_array_min_list_size: int,
+    cache_dir: Optional[str],
+    cache_size: int,
+) -> float:
+    """Write a figure into files of multiple formats, and return the elapsed time.
+    The settings in `default` are resolved by the caller and given as arguments,
+    since worker processes do not see changes of them.
+
+    positional arguments:
+      @ include_plotlyjss : `include_plotlyjs` of each HTML file (None for images).
+      @ scale             : Scale of the images.
+    """
+    t = perf_counter()
+    # Numerical arrays are encoded only once for both the hash and the HTML file
+    fig_dict_enc = encode_typed_arrays(
+        fig_dict, typed_arrays, typed_array_min_list_size
+    )
+    fig_hash = (
+        sha256(
+            f"{plotly.__version__}:{fig_to_json(fig_dict_enc, encoded=True)}".encode()
+        ).hexdigest()
+        if cache_dir is not None
+        else None
+    )
+    for out_fname, include_plotlyjs in zip(out_fnames, include_plotlyjss):
+        if out_fname.endswith(".html"):
+            pio.write_html(
+                fig_dict_enc,
+                file=out_fname,
+                config=config,
+                include_plotlyjs=include_plotlyjs,
+                validate=False,
+            )
+        else:
+            _start_kaleido_server()
+            _write_image_cached(
+                fig_dict,
+                fig_hash,
+                out_fname,
+                scale,
+                cache_dir,
+                cache_size,
+            )
+    return perf_counter() - t
+
+
+def export_many(
+    figs: Sequence[go.Figure],
+    out_images: Union[str, Sequence[str]],
+    workers: int = 1,
+    config: Optional[Dict] = None,
+    embed_plotlyjs: Union[bool, str] = False,
+    verbose: bool = False,
+) -> List[float]:
+    """Output multiple figures to image/HTML files in parallel.
+
+    positional arguments:
+      @ figs       : Figure objects.
+      @ out_images : Image/HTML file name(s) for each figure. The format is e.g.:
+                       - `out.pdf` for single output
+                       - `out.{svg,pdf,html}` for multiple outputs
+                     .[png|jpeg|svg|pdf|eps|html] are supported.
+                     If a single string, "{i}" in it is replaced with the index
+                     of each figure, e.g. `fig_{i}.{svg,png}`.
+
+    optional arguments:
+      @ workers        : Number of worker processes, each of which keeps its own
+                         Kaleido process. If 1, output in the current process.
+      @ config         : Config for HTML files.
+      @ embed_plotlyjs : If True, embed plotly.js codes (~3 MB) in the output HTML files.
+                         If "shared", write plotly.js once into the directory of
+                         the HTML files (or `default.plotlyjs_dir`) and refer to it.
+      @ verbose        : Log the elapsed time for each figure.
+
+    Images are reused from `default.export_cache_dir` if it is set (see `default`).
+
+    Returns the elapsed time (in seconds) for each figure.
+    """
+    global _pool, _pool_size
+
+    if isinstance(out_images, str):
+        out_images = [out_images.replace("{i}", str(i)) for i in range(len(figs))]
+    assert len(figs) == len(
+        out_images
+    ), f"# of figures ({len(figs)}) != # of output file names ({len(out_images)})"
+
+    # Each figure is serialized only once for all of its formats
+    fig_dicts = [fig.to_plotly_json() for fig in figs]
+    out_fnamess = [_expand_out_image(out_image) for out_image in out_images]
+
+    # Settings resolved here for worker processes
+    include_plotlyjsss = [
+        [
+            (
+                (
+                    shared_plotlyjs_src(os.path.dirname(os.path.abspath(out_fname)))
+                    if embed_plotlyjs == "shared"
+                    else embed_plotlyjs
+                )
+                if out_fname.endswith(".html")
+                else None
+            )
+            for out_fname in out_fnames
+        ]
+        for out_fnames in out_fnamess
+    ]
+    scales = [
+        (
+            _export_scale(fig_dict)
+            if any(not out_fname.endswith(".html") for out_fname in out_fnames)
+            else None
+        )
+        for fig_dict, out_fnames in zip(fig_dicts, out_fnamess)
+    ]
+    settings = (
+        default.typed_arrays,
+        default.typed_array_min_list_size,
+        default.export_cache_dir,
+        default.export_cache_size,
+    )
+
+    if workers <= 1:
+        times = [
+            _export(fig_dict, out_fnames, config, include_plotlyjss, scale, *settings)
+            for fig_dict, out_fnames, include_plotlyjss, scale in zip(
+                fig_dicts, out_fnamess, include_plotlyjsss, scales
+            )
+        ]
+    else:
+        if _pool is None or _pool_size != workers:
+            if _pool is not None:
+                _pool.shutdown()
+            _pool = ProcessPoolExecutor(workers, initializer=_init_worker)
+            _pool_size = workers
+        times = list(
+            _pool.map(
+                _export,
+                fig_dicts,
+                out_fnamess,
+                [config] * len(figs),
+                include_plotlyjsss,
+                scales,
+                *[[x] * len(figs) for x in settings],
+            )
+        )
+
+    if verbose:
+        for out_image, t in zip(out_images, times):
+            logger.info(f"{out_image}: {t:.2f} sec")
+    return times
@@ -0,0 +1,123 @@
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from . import _layout as pll
+from ._histogram import hist
+from ._scatter import scatter
+from ._show import _assemble_mult
+
+
+def _group_slices(
+    df: pd.DataFrame, by: Union[str, Sequence[str]], sort: bool
+) -> Tuple[List, np.ndarray, List[slice]]:
+    """Group the rows once and return the group keys, the row order in which each
+    group is contiguous (None if the rows already are), and the slice of each group
+    in that order. Rows whose keys are NaN are dropped.
+    """
+    grouper = df.groupby(by, sort=sort, observed=True, dropna=True)
+    codes = grouper.ngroup().to_numpy()
+    sizes = grouper.size()
+    if np.all(codes[1:] >= codes[:-1]):
+        order = None
+    else:
+        order = np.argsort(codes, kind="stable")
+    start = int(np.count_nonzero(codes < 0))
+    ends = start + np.cumsum(sizes.to_numpy())
+    slices = [slice(s, e) for s, e in zip([start, *ends[:-1]], ends)]
+    return list(sizes.index), order, slices
+
+
+def facet(
+    df: pd.DataFrame,
+    x: str,
+    y: Optional[str] = None,
+    by: Optional[Union[str, Sequence[str]]] = None,
+    kind: str = "scatter",
+    trace_args: Optional[Dict] = None,
+    panel_layout: Optional[go.Layout] = None,
+    layout: Optional[go.Layout] = None,
+    n_col: int = 2,
+    sort: bool = True,
+    row_heights: Optional[Sequence[float]] = None,
+    col_widths: Optional[Sequence[float]] = None,
+    horizontal_spacing: Optional[float] = 0.1,
+    vertical_spacing: Optional[float] = 0.2,
+    shared_xaxes: Union[bool, str] = "all",
+    shared_yaxes: Union[bool, str] = "all",
+    autoscale_font_by: str = None,
+) -> go.Figure:
+    """Make a figure object with a subplot for each group of rows of a DataFrame.
+    The rows are grouped only once, and each subplot uses views of the columns.
+
+    positional arguments:
+      @ df : DataFrame of the data.
+      @ x  : Column name of the data on x-axis.
+
+    optional arguments:
+      @ y            : Column name of the data on y-axis. Required for "scatter".
+      @ by           : Column name(s) by which the rows are grouped. Required.
+      @ kind         : Must be one of {"scatter", "hist"}.
+      @ trace_args   : Arguments of `scatter` or `hist` shared by all subplots.
+                       For "hist", `start` and `end` are by default the min and max
+                       of the entire column so that all subplots have the same bins.
+      @ panel_layout : A layout object shared by all subplots.
+                       Default: `layout(x_title=x, y_title=y)`.
+      @ layout       : A layout object for the overall figure.
+      @ sort         : If True, subplots are in the sorted order of the groups.
+                       Otherwise in the order of the first appearance.
+      @ others       : See `figure_mult`.
+    """
+    assert by is not None, "`by` must be specified"
+    assert kind in ("scatter", "hist"), '`kind` must be one of {"scatter", "hist"}'
+    assert kind != "scatter" or y is not None, '`y` must be specified for "scatter"'
+    trace_args = {} if trace_args is None else dict(trace_args)
+
+    keys, order, slices = _group_slices(df, by, sort)
+    assert len(keys) > 0, "No groups"
+    columns = [df[col].to_numpy() for col in (x, y) if col is not None]
+    if order is not None:
+        columns = [data[order] for data in columns]
+
+    if kind == "hist":
+        data = columns[0]
+        if trace_args.get("start") is None:
+            trace_args["start"] = np.nanmin(data)
+        if trace_args.get("end") is None:
+            trace_args["end"] = np.nanmax(data)
+        sub_tracess = [(hist(data[s], **trace_args),) for s in slices]
+    else:
+        xs, ys = columns
+        sub_tracess = [(scatter(xs[s], ys[s], **trace_args),) for s in slices]
+
+    # The layout of subplots is converted only once
+    if panel_layout is None:
+        panel_layout = pll.layout(x_title=x, y_title=y)
+    panel_layout = panel_layout.to_plotly_json()
+    panel_title = panel_layout.get("title", {})
+    sub_layouts = [
+        dict(
+            panel_layout,
+            title=dict(
+                panel_title,
+                text=", ".join(map(str, key)) if isinstance(key, tuple) else str(key),
+            ),
+        )
+        for key in keys
+    ]
+
+    return _assemble_mult(
+        sub_tracess,
+        sub_layouts,
+        layout,
+        n_col,
+        row_heights,
+        col_widths,
+        horizontal_spacing,
+        vertical_spacing,
+        shared_xaxes,
+        shared_yaxes,
+        autoscale_font_by,
+    )
@@ -0,0 +1,19 @@
+import os
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+
+@contextmanager
+def atomic_path(fname: str) -> Iterator[str]:
+    """Yield a temporary file name to be written, which replaces `fname` at the end
+    of the block, so that a partial file is never seen by other threads/processes.
+    The temporary file is removed if the block fails.
+    """
+    tmp_fname = f"{fname}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        yield tmp_fname
+        os.replace(tmp_fname, fname)
+    finally:
+        if os.path.exists(tmp_fname):
+            os.remove(tmp_fname)
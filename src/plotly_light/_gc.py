@@ -0,0 +1,151 @@
+import argparse
+import glob
+import os
+import time
+from typing import List, Optional
+
+from logzero import logger
+
+from . import default
+from ._const import IFRAME_DIR
+from ._file import atomic_path
+
+# Replaces an evicted HTML file so that the iframe in a notebook shows a message
+# instead of an error
+_PLACEHOLDER_MARK = "<!-- plotly_light: evicted -->"
+_PLACEHOLDER_HTML = f"""\
+<!DOCTYPE html>
+{_PLACEHOLDER_MARK}
+<html><body><p style="color: gray; font-family: sans-serif;">
+This plot was removed to save disk space. Re-run the cell to show it again.
+</p></body></html>
+"""
+
+
+def _is_placeholder(fname: str, size: int) -> bool:
+    if size > len(_PLACEHOLDER_HTML) * 2:
+        return False
+    with open(fname, "r") as f:
+        return _PLACEHOLDER_MARK in f.read()
+
+
+def _parse_size(size: str) -> int:
+    """Convert e.g. "500M" or "2G" into bytes."""
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+    size = size.strip().upper().rstrip("B")
+    if size[-1:] in units:
+        return int(float(size[:-1]) * units[size[-1]])
+    return int(size)
+
+
+def gc_htmls(
+    directory: str = IFRAME_DIR,
+    max_size: Optional[int] = None,
+    max_age: Optional[float] = None,
+    placeholder: bool = True,
+    dry_run: bool = False,
+) -> List[str]:
+    """Evict HTML files of plots in `directory` by age and then in the order of least
+    recently used (i.e. last access or modification) until the total size is within
+    the budget. Unlike `_remove_unused_htmls()`, plots still referenced in notebooks
+    are also evicted.
+
+    optional arguments:
+      @ directory   : Directory of the HTML files.
+      @ max_size    : Maximum total size of the HTML files in bytes.
+                      Default: `default.iframe_gc_max_size`. No limit if None.
+      @ max_age     : Maximum days since the last access of each HTML file.
+                      Default: `default.iframe_gc_max_age`. No limit if None.
+      @ placeholder : If True, replace evicted files with a small placeholder HTML
+                      instead of removing them.
+      @ dry_run     : Only return the files to be evicted.
+
+    Returns the file names evicted.
+    """
+    if max_size is None:
+        max_size = default.iframe_gc_max_size
+    if max_age is None:
+        max_age = default.iframe_gc_max_age
+
+    now = time.time()
+    entries = []
+    for fname in glob.glob(os.path.join(directory, "*.html")):
+        try:
+            stat = os.stat(fname)
+            if _is_placeholder(fname, stat.st_size):
+                continue
+        except FileNotFoundError:  # removed by another process
+            continue
+        last_used = max(stat.st_atime, stat.st_mtime)
+        entries.append((last_used, stat.st_size, fname))
+    entries.sort()
+
+    evicted = []
+    total_size = sum(size for _, size, _ in entries)
+    for last_used, size, fname in entries:
+        is_old = max_age is not None and now - last_used > max_age * 86400
+        is_over = max_size is not None and total_size > max_size
+        if not (is_old or is_over):
+            continue
+        evicted.append(fname)
+        total_size -= size
+        if dry_run:
+            continue
+        try:
+            if placeholder:
+                # Written via a temporary file not to leave a partial file
+                with atomic_path(fname) as tmp_fname, open(tmp_fname, "w") as f:
+                    f.write(_PLACEHOLDER_HTML)
+            else:
+                os.remove(fname)
+        except FileNotFoundError:
+            pass
+    return evicted
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command-line entry point of `gc_htmls()`."""
+    parser = argparse.ArgumentParser(
+        description="Evict old HTML files of plots drawn by plotly_light in Jupyter."
+    )
+    parser.add_argument(
+        "directories",
+        nargs="*",
+        default=[IFRAME_DIR],
+        help=f"Directories of the HTML files [{IFRAME_DIR}]",
+    )
+    parser.add_argument(
+        "-s",
+        "--max-size",
+        type=_parse_size,
+        default=None,
+        help="Maximum total size per directory (e.g. 500M, 2G)",
+    )
+    parser.add_argument(
+        "-a",
+        "--max-age",
+        type=float,
+        default=None,
+        help="Maximum days since the last access of each file",
+    )
+    parser.add_argument(
+        "--remove",
+        action="store_true",
+        help="Remove evicted files instead of replacing them with placeholders",
+    )
+    parser.add_argument(
+        "-n", "--dry-run", action="store_true", help="Only list the files to be evicted"
+    )
+    args = parser.parse_args(argv)
+
+    for directory in args.directories:
+        evicted = gc_htmls(
+            directory,
+            max_size=args.max_size,
+            max_age=args.max_age,
+            placeholder=not args.remove,
+            dry_run=args.dry_run,
+        )
+        for fname in evicted:
+            print(fname)
+        logger.info(f"{directory}: {len(evicted)} files evicted")
@@ -1,12 +1,17 @@
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from numbers import Number
-from typing import Any, Mapping, Optional, Sequence, Union
+from typing import Any, Iterable, List, Mapping, Optional, Sequence, Union
 
 import numpy as np
+import pandas as pd
 import plotly.graph_objects as go
 
+from . import default
 from ._bar import bar
 from ._line import lines
+from ._precision import Precision, quantize
+from ._trace import make_trace
 
 
 class RelCounter(Counter):
@@ -17,8 +22,132 @@ class RelCounter(Counter):
         return {k: v / tot * 100 for k, v in self.items()}
 
 
+def _as_array(data: Any) -> Optional[np.ndarray]:
+    """Convert an array-like object (e.g. ndarray, pandas Series, Arrow array) into
+    an ndarray. Return None if `data` is not array-like or is a scalar.
+    """
+    if hasattr(data, "to_numpy"):
+        data = data.to_numpy()
+    elif hasattr(data, "__array__"):
+        data = np.asarray(data)
+    else:
+        return None
+    return data if data.ndim > 0 else None
+
+
+def _as_numeric(data: Any) -> np.ndarray:
+    """Convert data into an array, with booleans into integers for the arithmetic."""
+    data = np.asarray(data)
+    return data.astype(np.int64) if data.dtype.kind == "b" else data
+
+
+class HistAccumulator:
+    """Histogram with fixed bins to which data are added chunk by chunk, e.g. from
+    a generator, a memory-mapped array, or row groups of a parquet file.
+    Accumulators with the same bins can be merged, e.g. those computed in
+    different processes. A finished accumulator can be passed to `hist()`.
+
+    positional arguments:
+      @ start : Start position of the plot range.
+      @ end   : End position of the plot range.
+
+    optional arguments:
+      @ bin_size : Size of each bin.
+      @ bin_num  : Number of bins. Ignored if `bin_size` is set.
+    """
+
+    def __init__(
+        self,
+        start: float,
+        end: float,
+        bin_size: Optional[float] = None,
+        bin_num: int = 10,
+    ) -> None:
+        if bin_size is not None:
+            bin_num = -int(-(end - start + bin_size) // bin_size)
+        else:
+            bin_size = (end - start) / bin_num
+        self.bin_num = bin_num
+        self.bin_range = (start - bin_size / 2, end + bin_size / 2)
+        self.counts = np.zeros(bin_num, dtype=np.int64)
+        # For integer data, the value of the first bin if each bin is [n - 0.5, n + 0.5)
+        self._int_start = (
+            int(self.bin_range[0] + 0.5)
+            if self.bin_range[1] - self.bin_range[0] == bin_num
+            and float(self.bin_range[0] + 0.5).is_integer()
+            else None
+        )
+        # Total number of data including those out of the bins
+        self.n_data = 0
+
+    @property
+    def bin_edges(self) -> np.ndarray:
+        return np.linspace(*self.bin_range, self.bin_num + 1)
+
+    @property
+    def bin_centers(self) -> np.ndarray:
+        bin_edges = self.bin_edges
+        return (bin_edges[:-1] + bin_edges[1:]) / 2
+
+    def frequencies(self, relative: bool = False) -> np.ndarray:
+        """Counts of each bin, or relative frequencies to the number of all data."""
+        return self.counts / self.n_data if relative else self.counts
+
+    def add(
+        self,
+        data: Union[Sequence, np.ndarray, Iterable[Sequence]],
+        chunk_size: int = 10_000_000,
+    ) -> "HistAccumulator":
+        """Add data to the histogram.
+
+        positional arguments:
+          @ data : An array of numbers (e.g. list, ndarray, pandas Series), or
+                   an iterable of arrays (chunks) of numbers, e.g. a generator.
+
+        optional arguments:
+          @ chunk_size : An array is added every `chunk_size` elements to limit
+                         the memory usage (e.g. for a memory-mapped array).
+        """
+        arr = _as_array(data)
+        if arr is None and isinstance(data, Sequence):
+            # A list of numbers, or a list of (possibly ragged) chunks
+            if len(data) == 0 or not (
+                isinstance(data[0], Sequence) or _as_array(data[0]) is not None
+            ):
+                arr = np.asarray(data)
+        if arr is not None:
+            for i in range(0, max(len(arr), 1), chunk_size):
+                self._add_chunk(arr[i : i + chunk_size])
+        else:
+            for chunk in data:
+                self.add(chunk, chunk_size)
+        return self
+
+    def _add_chunk(self, chunk: np.ndarray) -> None:
+        chunk = _as_numeric(chunk).ravel()
+        if chunk.dtype.kind in "iu" and self._int_start is not None:
+            # Integer data with unit bins
+            indices = chunk.astype(np.int64) - self._int_start
+            indices = indices[(indices >= 0) & (indices < self.bin_num)]
+            self.counts += np.bincount(indices, minlength=self.bin_num)
+        else:
+            counts, _ = np.histogram(chunk, bins=self.bin_num, range=self.bin_range)
+            self.counts += counts
+        self.n_data += len(chunk)
+
+    def merge(self, *others: "HistAccumulator") -> "HistAccumulator":
+        """Add the counts of other accumulators with the same bins."""
+        for other in others:
+            assert (
+                self.bin_num == other.bin_num and self.bin_range == other.bin_range
+            ), "Cannot merge histograms with different bins"
+            self.counts += other.counts
+            self.n_data += other.n_data
+        return self
+
+
 def hist(
-    data: Union[Sequence, Mapping[Any, int]],
+    data: Union[Sequence, Mapping[Any, int], HistAccumulator],
     text: Optional[Sequence] = None,
     start: Optional[int] = None,
     end: Optional[int] = None,
@@ -35,11 +164,13 @@ def hist(
     name: Optional[str] = None,
     show_legend: bool = False,
     show_init: bool = True,
+    precision: Precision = None,
 ) -> Union[go.Bar, go.Histogram]:
     """Create a simple Trace object of a histogram.
 
     positional arguments:
-      @ data : Raw data of numbers or counter of numbers
+      @ data : Raw data of numbers, counter of numbers, or `HistAccumulator`.
+               `start`, `end`, `bin_size` and `bin_num` are ignored for `HistAccumulator`.
 
     optional arguments:
       @ text          : Texts for each data.
@@ -57,20 +188,35 @@ def hist(
       @ name          : Display name of the trace in legend.
       @ show_legend   : Show this trace in legend.
       @ show_init       : Show this trace initially.
+      @ precision     : Precision of the bin positions and the frequencies.
+                        See `scatter`.
 
     optional arguments valid only if `use_lines` is True:
       @ line_width    : Corresponds to bin width.
       @ use_webgl     : Use WebGL instead of SVG.
     """
+    if precision is None:
+        precision = default.precision
 
     def _to_trace(x, y) -> Union[go.Bar, go.Scatter]:
         if use_lines:
-            return lines(
-                (
-                    [(_x, 0, _x, _y) for _x, _y in zip(x, y)]
+            x, y = np.asarray(x), np.asarray(y)
+            if x.dtype.kind in "iuf":
+                zeros = np.zeros(len(x))
+                coords = (
+                    np.column_stack([x, zeros, x, y])
                     if not horizontal_plot
-                    else [(0, _x, _y, _x) for _x, _y in zip(x, y)]
-                ),
+                    else np.column_stack([zeros, x, y, x])
+                )
+            else:
+                # Categories are kept as they are not to stringify the frequencies
+                coords = (
+                    [(_x, 0, _x, _y) for _x, _y in zip(x.tolist(), y.tolist())]
+                    if not horizontal_plot
+                    else [(0, _x, _y, _x) for _x, _y in zip(x.tolist(), y.tolist())]
+                )
+            return lines(
+                coords,
                 text=text,
                 width=line_width,
                 col=col,
@@ -79,8 +225,10 @@ def hist(
                 show_legend=show_legend,
                 show_init=show_init,
                 use_webgl=use_webgl,
+                precision=precision,
             )
         else:
+            x, y = quantize(x, precision), quantize(y, precision)
             return bar(
                 x=x if not horizontal_plot else y,
                 y=y if not horizontal_plot else x,
@@ -93,6 +241,15 @@ def hist(
                 show_init=show_init,
             )
 
+    # Already binned data
+    if isinstance(data, HistAccumulator):
+        assert data.n_data > 0, "Empty data"
+        if text is not None:
+            assert (
+                len(text) == data.bin_num
+            ), f"Length of `text` ({len(text)}) != # of bins ({data.bin_num})"
+        return _to_trace(data.bin_centers, data.frequencies(relative))
+
     assert len(data) > 0, "Empty data"
 
     # Use the original histogram function anyway (not recommended)
@@ -100,7 +257,8 @@ def hist(
         assert isinstance(
             data, Sequence
         ), "Only Sequence objects are supported if `use_histogram`."
-        return go.Histogram(
+        return make_trace(
+            go.Histogram,
             x=data if not horizontal_plot else None,
             y=data if horizontal_plot else None,
             xbins=(
@@ -119,8 +277,8 @@ def hist(
             visible=None if show_init else "legendonly",
         )
 
-    # Already a dictionary (counter), or non-numerical, categorical data
-    if isinstance(data, Mapping) or not isinstance(next(iter(data)), Number):
+    # Already a dictionary (counter)
+    if isinstance(data, Mapping):
         counter = RelCounter(data)
         if relative:
             counter = counter.relative()
@@ -129,26 +287,116 @@ def hist(
                 text
             ), f"Length of `text` ({len(text)}) != # of data ({len(counter)})"
         return _to_trace(*zip(*counter.items()))
+    # Non-numerical, categorical data. Categories are in the order of appearance.
+    if not isinstance(next(iter(data)), Number):
+        try:
+            codes, categories = pd.Series(data).factorize(use_na_sentinel=False)
+        except TypeError:  # pandas < 1.5
+            codes, categories = pd.Series(data).factorize(na_sentinel=None)
+        counts = np.bincount(codes, minlength=len(categories))
+        if relative:
+            counts = counts / len(codes) * 100
+        if text is not None:
+            assert len(counts) == len(
+                text
+            ), f"Length of `text` ({len(text)}) != # of data ({len(counts)})"
+        return _to_trace(categories, counts)
     # Numerical data
+    data = _as_numeric(data)
     if start is None:
-        start = min(data)
+        start = np.nanmin(data)
     if end is None:
-        end = max(data)
-    if bin_size is not None:
-        bin_num = -int(-(end - start + bin_size) // bin_size)
-    else:
-        bin_size = (end - start) / bin_num
-    counts, bin_edges = np.histogram(
-        data,
-        weights=(np.ones(len(data)) / float(len(data)) if relative else None),
-        range=(start - bin_size / 2, end + bin_size / 2),
-        bins=bin_num,
-    )
+        end = np.nanmax(data)
+    acc = HistAccumulator(start, end, bin_size, bin_num).add(data)
+    counts = acc.frequencies(relative)
     if text is not None:
         assert len(counts) == len(
             text
         ), f"Length of `text` ({len(text)}) != # of bins ({len(counts)})"
-    return _to_trace(
-        [(bin_edges[i] + bin_edges[i + 1]) / 2 for i in range(len(bin_edges) - 1)],
-        counts,
-    )
+    return _to_trace(acc.bin_centers, counts)
+
+
+def hist_many(
+    datas: Sequence[Sequence],
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    bin_size: Optional[int] = None,
+    bin_num: int = 10,
+    relative: bool = False,
+    horizontal_plot: bool = False,
+    cols: Optional[Sequence[str]] = None,
+    opacity: float = 1,
+    use_lines: bool = False,
+    line_width: float = 1,
+    use_webgl: bool = False,
+    names: Optional[Sequence[str]] = None,
+    show_legend: bool = False,
+    show_init: bool = True,
+    n_threads: Optional[int] = None,
+    precision: Precision = None,
+) -> List[Union[go.Bar, go.Scatter]]:
+    """Create Trace objects of histograms of multiple datasets with common bins.
+    The range of the bins is computed once over all datasets, and the datasets
+    are binned in parallel threads.
+
+    positional arguments:
+      @ datas : List of raw data of numbers.
+
+    optional arguments:
+      @ start         : Start position of the plot range. Default: min of all data.
+      @ end           : End position of the plot range. Default: max of all data.
+      @ bin_size      : Size of each bin.
+      @ bin_num       : Number of bins. Ignored if `bin_size` is set.
+      @ relative      : Convert values in y-axis to relative frequencies.
+      @ cols          : Color of bars for each dataset.
+      @ opacity       : Opacity of bars.
+      @ use_lines     : If True, draw as lines of a scatter plot.
+      @ names         : Display name of each trace in legend.
+      @ show_legend   : Show the traces in legend.
+      @ show_init     : Show the traces initially.
+      @ n_threads     : Number of threads for binning. Default: # of CPUs + 4 (max 32).
+      @ precision     : Precision of the bin positions and the frequencies.
+                        See `scatter`.
+
+    optional arguments valid only if `use_lines` is True:
+      @ line_width    : Corresponds to bin width.
+      @ use_webgl     : Use WebGL instead of SVG.
+
+    To draw the histograms in a single plot, use e.g. `layout(barmode="overlay")`.
+    """
+    assert len(datas) > 0, "Empty datasets"
+    for arg, arg_name in ((cols, "cols"), (names, "names")):
+        assert arg is None or len(arg) == len(
+            datas
+        ), f"Length of `{arg_name}` ({len(arg)}) != # of datasets ({len(datas)})"
+
+    with ThreadPoolExecutor(n_threads) as executor:
+        datas = list(executor.map(_as_numeric, datas))
+        if start is None:
+            start = min(executor.map(np.nanmin, datas))
+        if end is None:
+            end = max(executor.map(np.nanmax, datas))
+        accs = list(
+            executor.map(
+                lambda data: HistAccumulator(start, end, bin_size, bin_num).add(data),
+                datas,
+            )
+        )
+
+    return [
+        hist(
+            acc,
+            relative=relative,
+            horizontal_plot=horizontal_plot,
+            col=None if cols is None else cols[i],
+            opacity=opacity,
+            use_lines=use_lines,
+            line_width=line_width,
+            use_webgl=use_webgl,
+            name=None if names is None else names[i],
+            show_legend=show_legend,
+            show_init=show_init,
+            precision=precision,
+        )
+        for i, acc in enumerate(accs)
+    ]
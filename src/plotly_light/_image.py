@@ -1,3 +1,5 @@
+import os
+from math import ceil
 from typing import Optional, Tuple
 
 import PIL.Image
@@ -8,6 +10,30 @@ from logzero import logger
 from . import _layout as pll
 from . import default
 from ._show import show
+from ._tile import _open_image, _sized_cache, _to_data_uri, tile_images
+
+
+@_sized_cache(lambda: default.image_cache_size)
+def _encode_image(
+    fname: str,
+    mtime: float,
+    max_width: Optional[int],
+    max_height: Optional[int],
+    img_format: str,
+    img_quality: int,
+) -> str:
+    """Encode an image file into a data URI, downscaling it to fit in
+    `max_width` x `max_height` px if larger. `mtime` is only for the cache key.
+    """
+    src = _open_image(fname, mtime)
+    factor = 1
+    if max_width is not None and max_height is not None:
+        max_width, max_height = max(max_width, 1), max(max_height, 1)
+        factor = max(int(max(src.width / max_width, src.height / max_height)), 1)
+    img = src.read(factor=factor)
+    if max_width is not None and max_height is not None:
+        img.thumbnail((max_width, max_height), PIL.Image.LANCZOS)
+    return _to_data_uri(img, img_format, img_quality)
 
 
 def image(
@@ -22,10 +48,53 @@ def image(
     opacity: Optional[float] = None,
     layout: go.Layout = None,
     autoscale_font_by: str = None,
+    downscale: bool = True,
+    dpr: Optional[float] = None,
+    img_format: Optional[str] = None,
+    img_quality: Optional[int] = None,
+    tiled: bool = False,
+    tile_size: int = 512,
+    widget: bool = False,
     verbose: bool = False,
 ):
-    img = PIL.Image.open(in_fname)
-    iw, ih = img.size
+    """Create a figure of an image file.
+
+    positional arguments:
+      @ in_fname : Name of the image file. A `.npy` file of a 2D (grayscale) or
+                   3D (RGB[A]) array is memory-mapped and read lazily.
+
+    optional arguments:
+      @ width | height  : Of the plot including `axis_label_size`.
+      @ [x|y]_range     : Coordinates of the image on [x|y]-axis.
+      @ layer           : Drawing layer. Must be one of {'above', 'below'}.
+      @ downscale       : If True, downscale the image to the plot size in px
+                          times `dpr` if the image is larger than it.
+      @ dpr             : Device pixel ratio. Default: `default.image_dpr`.
+      @ img_format      : {"png", "jpeg", "webp"}. Default: `default.image_format`.
+      @ img_quality     : For "jpeg" and "webp". Default: `default.image_quality`.
+      @ tiled           : If True, draw the image as tiles of `tile_size` px at the
+                          display resolution. Use this for very large images.
+      @ widget          : If True (and `tiled`), return a `go.FigureWidget` that
+                          loads tiles at a higher resolution when zoomed in.
+    """
+    if dpr is None:
+        dpr = default.image_dpr
+    if img_format is None:
+        img_format = default.image_format
+    if img_quality is None:
+        img_quality = default.image_quality
+    assert img_format in (
+        "png",
+        "jpeg",
+        "webp",
+    ), "`img_format` must be one of {'png', 'jpeg', 'webp'}"
+
+    assert not widget or tiled, "`widget` requires `tiled`"
+
+    # Only the header is read here
+    fname, mtime = os.path.realpath(in_fname), os.path.getmtime(in_fname)
+    src = _open_image(fname, mtime)
+    iw, ih = src.width, src.height
     ar = ih / iw
 
     if x_range is not None:
@@ -101,22 +170,69 @@ def image(
     fig.update_xaxes(constrain='domain')
     fig.update_yaxes(constrain='domain')
     
-    fig.add_layout_image(
-        dict(
-            source=img,
-            xref="x",
-            yref="y",
-            x=xb,
-            y=ye,
-            sizex=xe - xb,
-            sizey=yb - ye,
-            sizing="stretch",
-            layer=layer,
-            opacity=opacity,
-        )
+    target_size = (
+        int((width - axis_label_size) * dpr),
+        int((height - axis_label_size) * dpr),
     )
+    if tiled:
+        images = tile_images(
+            fname,
+            mtime,
+            (0, 0, iw, ih),
+            target_size if downscale else (iw, ih),
+            (xb, xe, yb, ye),
+            tile_size,
+            img_format,
+            img_quality,
+        )
+    else:
+        images = [
+            dict(
+                source=_encode_image(
+                    fname,
+                    mtime,
+                    *(target_size if downscale else (None, None)),
+                    img_format,
+                    img_quality,
+                ),
+                xref="x",
+                yref="y",
+                x=xb,
+                y=ye,
+                sizex=xe - xb,
+                sizey=yb - ye,
+                sizing="stretch",
+            )
+        ]
+    for _image in images:
+        fig.add_layout_image(_image, layer=layer, opacity=opacity)
     pll.autoscale_plot_font_sizes(fig.layout, by=autoscale_font_by)
 
+    if widget:
+        fig = go.FigureWidget(fig)
+
+        def update_tiles(layout, x_range, y_range):
+            # Pixel region of the image in the current view
+            px = sorted((x - xb) / (xe - xb) * iw for x in x_range)
+            py = sorted((ye - y) / (ye - yb) * ih for y in y_range)
+            window = (int(px[0]), int(py[0]), ceil(px[1]), ceil(py[1]))
+            with fig.batch_update():
+                fig.layout.images = [
+                    dict(_image, layer=layer, opacity=opacity)
+                    for _image in tile_images(
+                        fname,
+                        mtime,
+                        window,
+                        target_size,
+                        (xb, xe, yb, ye),
+                        tile_size,
+                        img_format,
+                        img_quality,
+                    )
+                ]
+
+        fig.layout.on_change(update_tiles, "xaxis.range", "yaxis.range")
+
     return fig
 
 
@@ -131,6 +247,12 @@ def show_image(
     opacity: Optional[float] = None,
     layout: go.Layout = None,
     autoscale_font_by: str = None,
+    downscale: bool = True,
+    dpr: Optional[float] = None,
+    img_format: Optional[str] = None,
+    img_quality: Optional[int] = None,
+    tiled: bool = False,
+    tile_size: int = 512,
     return_fig: bool = False,
     verbose: bool = False,
 ) -> None:
@@ -142,6 +264,8 @@ def show_image(
     optional arguments:
       @ static         : If True, show the image as a non-interactive, static plot.
       @ width | height : Of the image.
+      @ downscale, dpr, img_format, img_quality, tiled, tile_size
+                       : See `image()`.
     """
     if static:
         assert not return_fig, "`return_fig` must not be True for static image"
@@ -158,6 +282,12 @@ def show_image(
         opacity=opacity,
         layout=layout,
         autoscale_font_by=autoscale_font_by,
+        downscale=downscale,
+        dpr=dpr,
+        img_format=img_format,
+        img_quality=img_quality,
+        tiled=tiled,
+        tile_size=tile_size,
         verbose=verbose,
     )
 
@@ -0,0 +1,121 @@
+from base64 import b64encode
+from typing import Any, Dict, Optional
+
+import numpy as np
+import plotly.io as pio
+from plotly.offline import get_plotlyjs_version
+
+from . import default
+
+try:
+    import orjson  # noqa: F401
+
+    _ENGINE = "orjson"
+except ImportError:
+    _ENGINE = "json"
+
+# Data types of typed arrays supported by plotly.js
+_DTYPES = {
+    "int8": "i1",
+    "uint8": "u1",
+    "int16": "i2",
+    "uint16": "u2",
+    "int32": "i4",
+    "uint32": "u4",
+    "float32": "f4",
+    "float64": "f8",
+}
+
+# Properties whose values must not be typed arrays
+_SKIPPED_KEYS = {"geojson", "layer", "layers", "range"}
+
+# plotly.js >= 2.28 can decode typed arrays
+_SUPPORTED = tuple(map(int, get_plotlyjs_version().split(".")[:2])) >= (2, 28)
+
+
+def _to_typed_array(value: Any, min_list_size: int) -> Optional[Dict[str, str]]:
+    """Convert a numerical array (or a list of numbers) into a plotly.js typed array
+    spec `{dtype, bdata[, shape]}`. Return None if impossible.
+    """
+    if isinstance(value, np.ndarray):
+        arr = value
+    elif isinstance(value, (list, tuple)):
+        if len(value) < min_list_size:
+            return None
+        try:
+            arr = np.asarray(value)
+        except ValueError:  # ragged
+            return None
+    elif hasattr(value, "to_numpy") and hasattr(value, "dtype"):  # pandas
+        arr = value.to_numpy()
+    else:
+        return None
+    if arr.size == 0 or arr.dtype.kind not in "iuf":
+        return None
+
+    if arr.dtype.kind in "iu" and arr.dtype.itemsize == 8:
+        # No 64-bit integers in JavaScript
+        vmin, vmax = arr.min(), arr.max()
+        for dtype in ("int8", "uint8", "int16", "uint16", "int32", "uint32"):
+            info = np.iinfo(dtype)
+            if info.min <= vmin and vmax <= info.max:
+                arr = arr.astype(dtype)
+                break
+        else:
+            arr = arr.astype("float64")
+    elif arr.dtype.kind == "f" and arr.dtype.name not in _DTYPES:
+        arr = arr.astype("float64" if arr.dtype.itemsize > 8 else "float32")
+
+    arr = np.ascontiguousarray(arr, dtype=arr.dtype.newbyteorder("<"))
+    spec = dict(dtype=_DTYPES[arr.dtype.name], bdata=b64encode(arr).decode("ascii"))
+    if arr.ndim > 1:
+        spec["shape"] = ", ".join(map(str, arr.shape))
+    return spec
+
+
+def _encode(obj: Any, min_list_size: int) -> Any:
+    if isinstance(obj, dict):
+        ret = {}
+        for k, v in obj.items():
+            spec = None if k in _SKIPPED_KEYS else _to_typed_array(v, min_list_size)
+            ret[k] = _encode(v, min_list_size) if spec is None else spec
+        return ret
+    if isinstance(obj, (list, tuple)) and any(isinstance(x, dict) for x in obj):
+        return [_encode(x, min_list_size) for x in obj]
+    return obj
+
+
+def encode_typed_arrays(
+    fig_dict: Dict,
+    typed_arrays: Optional[bool] = None,
+    min_list_size: Optional[int] = None,
+) -> Dict:
+    """Return a copy of a figure dict in which numerical arrays of the traces (and
+    frames) are replaced with base64-encoded typed arrays, if `typed_arrays` is True
+    and plotly.js supports them. The layout is kept as it is.
+
+    optional arguments:
+      @ typed_arrays  : Default: `default.typed_arrays`.
+      @ min_list_size : Default: `default.typed_array_min_list_size`.
+    """
+    if typed_arrays is None:
+        typed_arrays = default.typed_arrays
+    if min_list_size is None:
+        min_list_size = default.typed_array_min_list_size
+    if not (typed_arrays and _SUPPORTED):
+        return fig_dict
+    ret = dict(fig_dict)
+    if "data" in ret:
+        ret["data"] = [_encode(trace, min_list_size) for trace in ret["data"]]
+    if "frames" in ret:
+        ret["frames"] = [_encode(frame, min_list_size) for frame in ret["frames"]]
+    return ret
+
+
+def fig_to_json(fig_dict: Dict, encoded: bool = False) -> str:
+    """Serialize a figure dict with typed arrays, using orjson if installed.
+    If `encoded`, `fig_dict` is assumed to be already passed to `encode_typed_arrays`.
+    """
+    if not encoded:
+        fig_dict = encode_typed_arrays(fig_dict)
+    return pio.to_json(fig_dict, validate=False, engine=_ENGINE)
@@ -1,15 +1,58 @@
 from typing import Dict, List, Optional, Sequence, Tuple, Union
 
+import numpy as np
 import plotly.graph_objects as go
 
+from . import default
+from ._const import PAPER_AXIS_ID
+from ._precision import Precision
 from ._scatter import scatter
 
 Coord = Tuple[int, int, int, int]
 
 
+def _interleave(*cols: np.ndarray, sep=np.nan) -> np.ndarray:
+    """Interleave arrays of same length with separators, i.e.
+    [a0, b0, ..., sep, a1, b1, ..., sep, ...].
+    """
+    out = np.empty(
+        (len(cols[0]), len(cols) + 1),
+        dtype=object if sep is None else np.result_type(float, *cols),
+    )
+    for i, col in enumerate(cols):
+        out[:, i] = col
+    out[:, -1] = sep
+    return out.ravel()
+
+
+def _use_shape_trace(
+    coords: Union[Coord, List[Coord], np.ndarray], as_trace: Optional[bool]
+) -> bool:
+    """Whether shapes of `coords` should be drawn as a single trace."""
+    if as_trace is not None:
+        return as_trace
+    if default.shape_trace_threshold is None or isinstance(coords, tuple):
+        return False
+    return len(coords) > default.shape_trace_threshold
+
+
+def _to_shape_trace(trace: go.Scatter, xref: str, yref: str, layer: str) -> go.Scatter:
+    """Make a trace of shapes follow `[x|y]ref` and `layer` of layout shapes.
+    Coordinates in "paper" are drawn on invisible axes with range [0, 1], which
+    are added by `figure()` (or for each subplot by `figure_mult()`). Traces with
+    `layer="below"` are moved to the bottom of the other traces by them.
+    """
+    if xref == "paper":
+        trace.update(xaxis=f"x{PAPER_AXIS_ID}")
+    if yref == "paper":
+        trace.update(yaxis=f"y{PAPER_AXIS_ID}")
+    trace.update(meta=dict(layer=layer), hoverinfo="skip")
+    return trace
+
+
 def lines(
-    coords: Union[Coord, List[Coord]],
-    text: Optional[Sequence] = None,
+    coords: Union[Coord, List[Coord], np.ndarray],
+    text: Optional[Union[str, Sequence]] = None,
     width: float = 1,
     col: str = "black",
     opacity: Optional[float] = None,
@@ -17,28 +60,43 @@ def lines(
     show_legend: bool = False,
     show_init: bool = True,
     use_webgl: bool = False,
+    precision: Precision = None,
 ) -> go.Scatter:
     """For a collection of lines with same width and color. Returns as a Scatter object.
 
     positional arguments:
-      @ coords : (A list of) coordinate (x0, y0, x1, y1).
+      @ coords : (A list of) coordinate (x0, y0, x1, y1), or an array of shape (N, 4).
 
     optional arguments:
       @ width       : Line width applied to all lines.
       @ col         : Line color applied to all lines.
       @ opacity     : Opacity of the lines.
-      @ text        : Texts for each data.
+      @ text        : Texts for each data, or a single text for all lines.
       @ name        : Display name of the trace in the legend.
       @ show_legend : Show this trace in legend.
       @ use_webgl   : Use WebGL instead of SVG.
+      @ precision   : Precision of the coordinates. See `scatter`.
     """
-    if not isinstance(coords, list):
+    if not isinstance(coords, (list, np.ndarray)):
         coords = [coords]
 
+    _coords = np.asarray(coords)
+    if _coords.dtype.kind in "iuf":
+        # Numerical coordinates. Lines are separated by NaN.
+        _coords = _coords.reshape(-1, 4)
+        x = _interleave(_coords[:, 0], _coords[:, 2])
+        y = _interleave(_coords[:, 1], _coords[:, 3])
+    else:
+        # e.g. Categorical or datetime coordinates. Lines are separated by None.
+        x = [x for x0, _, x1, _ in coords for x in (x0, x1, None)]
+        y = [y for _, y0, _, y1 in coords for y in (y0, y1, None)]
+    if text is not None and not isinstance(text, str):
+        text = _interleave(text, text, sep=None)
+
     return scatter(
-        x=[x for x0, _, x1, _ in coords for x in (x0, x1, None)],
-        y=[y for _, y0, _, y1 in coords for y in (y0, y1, None)],
-        text=([x for t in text for x in (t, t, None)] if text is not None else text),
+        x=x,
+        y=y,
+        text=text,
         mode="lines",
         line_width=width,
         col=col,
@@ -47,22 +105,25 @@ def lines(
         show_legend=show_legend,
         show_init=show_init,
         use_webgl=use_webgl,
+        precision=precision,
     )
 
 
 def lines_shape(
-    coords: Union[Coord, List[Coord]],
+    coords: Union[Coord, List[Coord], np.ndarray],
     width: float = 1,
     col: str = "black",
     opacity: Optional[float] = None,
     xref: str = "x",
     yref: str = "y",
     layer: str = "above",
-) -> List[Dict]:
+    as_trace: Optional[bool] = None,
+    use_webgl: bool = False,
+) -> Union[List[Dict], go.Scatter]:
     """For a collection of lines with same width and color.
 
     positional arguments:
-      @ coords : (A list of) coordinate (x0, y0, x1, y1).
+      @ coords : (A list of) coordinate (x0, y0, x1, y1), or an array of shape (N, 4).
 
     optional arguments:
       @ width       : Line width applied to all lines.
@@ -73,7 +134,26 @@ def lines_shape(
                       and are interpreted as relative positions in the entire
                       [x|y]-axis.
       @ layer       : Drawing layer. Must be one of {'above', 'below'}.
+      @ as_trace    : If True, return a single Scatter trace drawing the same
+                      lines instead of a list of layout shapes. Use this for
+                      many lines, which are slow to pan/zoom as layout shapes.
+                      If None, True iff the number of lines is larger than
+                      `default.shape_trace_threshold`.
+      @ use_webgl   : Use WebGL instead of SVG. Used only for `as_trace`.
     """
+    if _use_shape_trace(coords, as_trace):
+        return _to_shape_trace(
+            lines(
+                coords,
+                width=width,
+                col=col,
+                opacity=opacity,
+                use_webgl=use_webgl,
+            ),
+            xref,
+            yref,
+            layer,
+        )
 
     def coord_to_shape(coord: Coord) -> Dict:
         x0, y0, x1, y1 = coord
@@ -90,7 +170,9 @@ def lines_shape(
             layer=layer,
         )
 
-    if not isinstance(coords, list):
+    if isinstance(coords, np.ndarray):
+        coords = coords.reshape(-1, 4).tolist()
+    elif not isinstance(coords, list):
         coords = [coords]
 
     return list(map(coord_to_shape, coords))
@@ -0,0 +1,70 @@
+from typing import Optional, Sequence, Union
+
+import numpy as np
+
+from . import default
+
+Precision = Optional[Union[str, int]]
+
+
+def _round_significant(x: np.ndarray, digits: int) -> np.ndarray:
+    """Round to `digits` significant digits."""
+    with np.errstate(divide="ignore"):
+        mag = np.floor(np.log10(np.abs(x)))
+    e = np.where(np.isfinite(mag), mag, 0) - (digits - 1)
+    # Multiply/divide by exact powers of 10 so that the results are the nearest
+    # floats of the decimals (i.e. shortest when printed)
+    p = 10.0 ** np.abs(e)
+    return np.where(e >= 0, np.round(x / p) * p, np.round(x * p) / p)
+
+
+def _snap_to_grid(x: np.ndarray, width: int) -> np.ndarray:
+    """Snap to a grid of a power of 10 finer than the pixels of the data range, and
+    downcast to float32 if it keeps the grid (and typed arrays are used).
+    """
+    if np.all(np.isnan(x)):
+        return x
+    vmin, vmax = np.nanmin(x), np.nanmax(x)
+    if not (np.isfinite(vmin) and np.isfinite(vmax)) or vmin == vmax:
+        return x
+    e = int(np.floor(np.log10((vmax - vmin) / (width * default.precision_grid_per_px))))
+    p = 10.0 ** abs(e)
+    x = np.round(x / p) * p if e >= 0 else np.round(x * p) / p
+    if default.typed_arrays:
+        x32 = x.astype(np.float32)
+        if np.nanmax(np.abs(x32 - x)) <= 10.0**e / 2:
+            return x32
+    return x
+
+
+def quantize(values: Sequence, precision: Precision, width: Optional[int] = None):
+    """Reduce the precision of floating-point coordinates to be serialized.
+    Return `values` as it is if `precision` is None or it is not numerical.
+
+    positional arguments:
+      @ values    : Coordinates of data.
+      @ precision : Must be one of {None, "float32", "grid", <int>}.
+                      - "float32" : Downcast to float32.
+                      - "grid"    : Snap to a grid finer than the pixels of the plot
+                                    (see `default.precision_grid_per_px`).
+                      - <int>     : Round to the number of significant digits.
+
+    optional arguments:
+      @ width : Size of the plot in px along the axis, used for "grid".
+                Default: `default.plot_size`.
+    """
+    if precision is None:
+        return values
+    assert precision in ("float32", "grid") or (
+        isinstance(precision, int) and precision > 0
+    ), '`precision` must be one of {None, "float32", "grid", <positive int>}'
+    if isinstance(values, (str, dict)):
+        return values
+    x = np.asarray(values)
+    if x.dtype.kind != "f":
+        return values
+    if precision == "float32":
+        return x.astype(np.float32)
+    if precision == "grid":
+        return _snap_to_grid(x, default.plot_size if width is None else width)
+    return _round_significant(x, precision)
@@ -1,15 +1,49 @@
 from typing import Dict, List, Optional, Sequence, Tuple, Union
 
+import numpy as np
 import plotly.graph_objects as go
 
+from ._line import _interleave, _to_shape_trace, _use_shape_trace
+from ._precision import Precision
 from ._scatter import scatter
 
 Coord = Tuple[int, int, int, int]
 Point = Tuple[int, int]
 
 
+def _closures(
+    x: Sequence,
+    y: Sequence,
+    frame_width: float,
+    frame_col: Optional[str],
+    fill_col: Optional[str],
+    opacity: float,
+    name: Optional[str],
+    show_legend: bool,
+    show_init: bool,
+    use_webgl: bool,
+    precision: Precision,
+) -> go.Scatter:
+    """Create a trace of closures from separated coordinates of vertices."""
+    return scatter(
+        x=x,
+        y=y,
+        mode="lines",
+        line_width=frame_width,
+        col=frame_col,
+        opacity=opacity,
+        fill="toself" if fill_col is not None else None,
+        fill_col=fill_col,
+        name=name,
+        show_legend=show_legend,
+        show_init=show_init,
+        use_webgl=use_webgl,
+        precision=precision,
+    )
+
+
 def closures(
-    coords: Union[List[Point], List[List[Point]]],
+    coords: Union[List[Point], List[List[Point]], np.ndarray],
     frame_width: float = 1,
     frame_col: Optional[str] = "black",
     fill_col: Optional[str] = "gray",
@@ -18,11 +52,15 @@ def closures(
     show_legend: bool = False,
     show_init: bool = True,
     use_webgl: bool = False,
+    offsets: Optional[Sequence[int]] = None,
+    precision: Precision = None,
 ) -> go.Scatter:
     """Create a trace with line shapes.
 
     positional arguments:
-      @ coords : (A list of) coordinate (x0, y0, x1, y1, x2, y2, x3, y3).
+      @ coords : (A list of) list of vertices [(x0, y0), (x1, y1), ...].
+                 If `offsets` is specified, an array of shape (M, 2) of the
+                 vertices of all closures concatenated.
 
     positional arguments:
       @ text        : Texts for each data point.
@@ -30,35 +68,58 @@ def closures(
       @ frame_width : Line width of the frame.
       @ frame_col   : Color of the frame.
       @ fill_col    : Color of the rectangle. To specify transparency, use "rgba()".
+      @ offsets     : Start positions of each closure in `coords`, plus the end
+                      position of the last closure (i.e. `coords[offsets[i]:offsets[i + 1]]`
+                      are the vertices of the i-th closure).
+      @ precision   : Precision of the coordinates. See `scatter`.
     """
-    if not isinstance(coords[0], list):
-        coords = [coords]
-    return scatter(
-        x=[
+    if offsets is not None:
+        # Flat vertex array + offsets. Closures are separated by NaN.
+        offsets = np.asarray(offsets)
+        vertices = np.asarray(coords, dtype=float)[offsets[0] : offsets[-1]]
+        offsets = offsets - offsets[0]
+        n_closures = len(offsets) - 1
+        counts = np.diff(offsets)
+        vertex_pos = np.arange(len(vertices)) + 2 * np.repeat(
+            np.arange(n_closures), counts
+        )
+        close_pos = offsets[1:] + 2 * np.arange(n_closures)
+        n_out = len(vertices) + 2 * n_closures
+        x, y = np.empty(n_out), np.empty(n_out)
+        for out, v in ((x, vertices[:, 0]), (y, vertices[:, 1])):
+            out[vertex_pos] = v
+            out[close_pos] = v[offsets[:-1]]
+            out[close_pos + 1] = np.nan
+    else:
+        if not isinstance(coords[0], list):
+            coords = [coords]
+        x = [
             x
             for _coords in coords
             for x in [x for x, y in _coords] + [_coords[0][0], None]
-        ],
-        y=[
+        ]
+        y = [
             y
             for _coords in coords
             for y in [y for x, y in _coords] + [_coords[0][1], None]
-        ],
-        mode="lines",
-        line_width=frame_width,
-        col=frame_col,
-        opacity=opacity,
-        fill="toself" if fill_col is not None else None,
-        fill_col=fill_col,
-        name=name,
-        show_legend=show_legend,
-        show_init=show_init,
-        use_webgl=use_webgl,
+        ]
+    return _closures(
+        x,
+        y,
+        frame_width,
+        frame_col,
+        fill_col,
+        opacity,
+        name,
+        show_legend,
+        show_init,
+        use_webgl,
+        precision,
     )
 
 
 def rects(
-    coords: Union[Coord, List[Coord]],
+    coords: Union[Coord, List[Coord], np.ndarray],
     frame_width: float = 1,
     frame_col: Optional[str] = "black",
     fill_col: Optional[str] = "gray",
@@ -67,11 +128,12 @@ def rects(
     show_legend: bool = False,
     show_init: bool = True,
     use_webgl: bool = False,
+    precision: Precision = None,
 ) -> go.Scatter:
     """Create a trace with rectangles.
 
     positional arguments:
-      @ coords : (A list of) coordinate (x0, y0, x1, y1).
+      @ coords : (A list of) coordinate (x0, y0, x1, y1), or an array of shape (N, 4).
 
     positional arguments:
       @ text        : Texts for each data point.
@@ -79,9 +141,27 @@ def rects(
       @ frame_width : Line width of the frame.
       @ frame_col   : Color of the frame.
       @ fill_col    : Color of the rectangle. To specify transparency, use "rgba()".
+      @ precision   : Precision of the coordinates. See `scatter`.
     """
-    if not isinstance(coords, list):
+    if not isinstance(coords, (list, np.ndarray)):
         coords = [coords]
+    _coords = np.asarray(coords)
+    if _coords.dtype.kind in "iuf":
+        # Numerical coordinates. Rectangles are separated by NaN.
+        x0, y0, x1, y1 = _coords.reshape(-1, 4).T
+        return _closures(
+            _interleave(x0, x0, x1, x1, x0),
+            _interleave(y0, y1, y1, y0, y0),
+            frame_width,
+            frame_col,
+            fill_col,
+            opacity,
+            name,
+            show_legend,
+            show_init,
+            use_webgl,
+            precision,
+        )
     coords = [[(x0, y0), (x0, y1), (x1, y1), (x1, y0)] for x0, y0, x1, y1 in coords]
     return closures(
         coords,
@@ -93,11 +173,12 @@ def rects(
         show_legend,
         show_init,
         use_webgl,
+        precision=precision,
     )
 
 
 def rects_shape(
-    coords: Union[Coord, List[Coord]],
+    coords: Union[Coord, List[Coord], np.ndarray],
     xref: str = "x",
     yref: str = "y",
     fill_col: str = "grey",
@@ -105,7 +186,9 @@ def rects_shape(
     frame_width: float = 1,
     frame_col: Optional[str] = "black",
     layer: str = "above",
-) -> Dict:
+    as_trace: Optional[bool] = None,
+    use_webgl: bool = False,
+) -> Union[List[Dict], go.Scatter]:
     """Create a (non-interactive) rectangle object.
 
     positional arguments:
@@ -121,6 +204,12 @@ def rects_shape(
       @ frame_width : Line width of the frame.
       @ frame_col   : Color of the frame.
       @ layer       : Drawing layer. Must be one of {'above', 'below'}.
+      @ as_trace    : If True, return a single Scatter trace drawing the same
+                      rectangles instead of a list of layout shapes. Use this for
+                      many rectangles, which are slow to pan/zoom as layout shapes.
+                      If None, True iff the number of rectangles is larger than
+                      `default.shape_trace_threshold`.
+      @ use_webgl   : Use WebGL instead of SVG. Used only for `as_trace`.
 
     `xref` must be one of {"x" (default), "paper"}. "paper" means `x0` and `x1` indicate
     horizontal relative positions of the entire plot (values are in [0, 1]).
@@ -133,6 +222,21 @@ def rects_shape(
     ), "`[x|y]ref` must be '[x|y]' or 'paper'"
     assert layer in ("above", "below"), "`layer` must be 'above' or 'below'"
 
+    if _use_shape_trace(coords, as_trace):
+        return _to_shape_trace(
+            rects(
+                coords,
+                frame_width=frame_width,
+                frame_col=frame_col,
+                fill_col=fill_col,
+                opacity=opacity,
+                use_webgl=use_webgl,
+            ),
+            xref,
+            yref,
+            layer,
+        )
+
     def coord_to_shape(coord: Coord) -> Dict:
         x0, y0, x1, y1 = coord
         return dict(
@@ -149,7 +253,9 @@ def rects_shape(
             layer=layer,
         )
 
-    if not isinstance(coords, list):
+    if isinstance(coords, np.ndarray):
+        coords = coords.reshape(-1, 4).tolist()
+    elif not isinstance(coords, list):
         coords = [coords]
 
     return list(map(coord_to_shape, coords))
@@ -1,15 +1,109 @@
+import json
 import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from hashlib import sha256
+from typing import Dict, List, Optional
 from uuid import uuid4
 
 import plotly.io as pio
+from logzero import logger
 from plotly.io._base_renderers import IFrameRenderer
 
+from . import default
+from ._bundle import shared_plotlyjs_src
 from ._const import IFRAME_DIR
+from ._file import atomic_path
+from ._gc import _is_placeholder
+from ._json import encode_typed_arrays, fig_to_json
+
+# Placeholder of an HTML file being written in background, which reloads itself
+# until the actual HTML file replaces it
+_LOADER_STUB = """\
+<!DOCTYPE html>
+<!-- plotly_light: loading -->
+<html><body><script>setTimeout(function () { location.reload(); }, 500);</script></body></html>
+"""
+_ERROR_HTML = """\
+<!DOCTYPE html>
+<html><body><pre>plotly_light: failed to write this plot
+{error}</pre></body></html>
+"""
+
+_executor: Optional[ThreadPoolExecutor] = None
+# HTML file name -> Future of the background write
+_pending: Dict[str, Future] = {}
+# HTML file names failed to be written and not yet reported by `flush_html_writes()`
+_failed: List[str] = []
+_pending_lock = threading.Lock()
+
+
+def _write_html_background(filename: str, write) -> None:
+    """Write an HTML file in a background thread. A loader stub is written first so
+    that the file can be shown in an iframe immediately.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(default.iframe_async_workers)
+
+    with open(filename, "w") as f:
+        f.write(_LOADER_STUB)
+
+    def _write() -> None:
+        # Failures are handled here instead of in a done-callback, which may run
+        # after `wait()` in `flush_html_writes()` returns
+        try:
+            with atomic_path(filename) as tmp_filename:
+                write(tmp_filename)
+        except Exception as error:
+            with _pending_lock:
+                _failed.append(filename)
+            logger.error(f"plotly_light: failed to write {filename}\n{error}")
+            with open(filename, "w") as f:
+                f.write(_ERROR_HTML.format(error=error))
+        finally:
+            with _pending_lock:
+                _pending.pop(filename, None)
+
+    # Registered under the lock so that `_write` never finishes before it
+    with _pending_lock:
+        _pending[filename] = _executor.submit(_write)
+
+
+def flush_html_writes(timeout: Optional[float] = None) -> List[str]:
+    """Wait for HTML files of plots being written in background (i.e. with
+    `default.iframe_async = True`), and return the file names that failed
+    since the last call.
+
+    optional arguments:
+      @ timeout : Maximum seconds to wait. Wait forever if None.
+    """
+    with _pending_lock:
+        futures = list(_pending.values())
+    _, not_done = wait(futures, timeout=timeout)
+    if len(not_done) > 0:
+        logger.warning(
+            f"plotly_light: {len(not_done)} HTML files are still being written"
+        )
+    with _pending_lock:
+        failed = list(_failed)
+        _failed.clear()
+    return failed
+
+
+def _is_loader_stub(filename: str) -> bool:
+    with open(filename) as f:
+        return f.read(len(_LOADER_STUB)) == _LOADER_STUB
 
 
 class MyIFrameRenderer(IFrameRenderer):
     """Custom renderer for `iframe` and `iframe_connected`, in which HTML file
     names of plots are unique and thus kept forever.
+    If `include_plotlyjs` is "shared", plotly.js is written only once (per version)
+    and every HTML file refers to it with a relative path.
+    If `default.iframe_content_hash` is True, HTML file names are hashes of the
+    figures instead, and the same figure is written only once.
+    If `default.iframe_async` is True, HTML files are written in background threads.
     """
 
     def __init__(
@@ -35,11 +129,11 @@ class MyIFrameRenderer(IFrameRenderer):
             self.root_dir = os.path.split(os.path.realpath(ipynb_fname))[0]
         else:
             self.root_dir = os.path.realpath(os.getcwd())
-        abs_html_directory = os.path.join(self.root_dir, self.html_directory)
+        self.abs_html_directory = os.path.join(self.root_dir, self.html_directory)
         try:
-            os.makedirs(abs_html_directory)
+            os.makedirs(self.abs_html_directory)
         except OSError as error:
-            if not os.path.isdir(abs_html_directory):
+            if not os.path.isdir(self.abs_html_directory):
                 raise error
 
     def to_mimebundle(self, fig_dict):
@@ -60,24 +154,59 @@ class MyIFrameRenderer(IFrameRenderer):
         else:
             iframe_height = str(525 + iframe_buffer) + "px"
 
-        # Build filename using ipython cell number
-        filename = self.build_filename()
-
-        write_html(
-            fig_dict,
-            filename,
-            config=self.config,
-            auto_play=self.auto_play,
-            include_plotlyjs=self.include_plotlyjs,
-            include_mathjax="cdn",
-            auto_open=False,
-            post_script=self.post_script,
-            animation_opts=self.animation_opts,
-            default_width="100%",
-            default_height=525,
-            validate=False,
-        )
+        # Numerical arrays are encoded only once for both the hash and the HTML file
+        fig_dict = encode_typed_arrays(fig_dict)
+
+        include_plotlyjs = self.include_plotlyjs
+        if include_plotlyjs == "shared":
+            include_plotlyjs = shared_plotlyjs_src(self.abs_html_directory)
+
+        # Build filename from the content or a random UUID
+        if default.iframe_content_hash:
+            filename = self.build_filename(
+                self.content_hash(fig_dict, include_plotlyjs)
+            )
+            # NOTE: A loader stub left by an interrupted write, and a placeholder of
+            # a file evicted by `gc_htmls()`, are overwritten
+            if os.path.isfile(filename) and (
+                filename in _pending
+                or not (
+                    _is_loader_stub(filename)
+                    or _is_placeholder(filename, os.path.getsize(filename))
+                )
+            ):
+                # Mark as recently used so that the file is not removed by
+                # `_remove_unused_htmls()` before the notebook is saved, and is
+                # evicted later by `gc_htmls()`
+                os.utime(filename)
+                return self.build_mimebundle(iframe_width, iframe_height)
+        else:
+            filename = self.build_filename()
+
+        def write(file):
+            write_html(
+                fig_dict,
+                file,
+                config=self.config,
+                auto_play=self.auto_play,
+                include_plotlyjs=include_plotlyjs,
+                include_mathjax="cdn",
+                auto_open=False,
+                post_script=self.post_script,
+                animation_opts=self.animation_opts,
+                default_width="100%",
+                default_height=525,
+                validate=False,
+            )
+
+        if default.iframe_async:
+            _write_html_background(filename, write)
+        else:
+            write(filename)
 
+        return self.build_mimebundle(iframe_width, iframe_height)
+
+    def build_mimebundle(self, iframe_width, iframe_height):
         # Build IFrame
         iframe_html = f"""\
 <iframe
@@ -92,8 +221,26 @@ allowfullscreen
 """
         return {"text/html": iframe_html}
 
-    def build_filename(self):
-        self.out_fname = f"{self.html_directory}/{uuid4()}.html"
+    def content_hash(self, fig_dict, include_plotlyjs):
+        """Hash of the figure and all the options of the HTML file."""
+        options = json.dumps(
+            [
+                self.config,
+                include_plotlyjs,
+                self.auto_play,
+                self.post_script,
+                self.animation_opts,
+            ],
+            sort_keys=True,
+            default=str,
+        )
+        fig_json = fig_to_json(fig_dict)
+        return sha256(f"{options}:{fig_json}".encode()).hexdigest()
+
+    def build_filename(self, name=None):
+        if name is None:
+            name = uuid4()
+        self.out_fname = f"{self.html_directory}/{name}.html"
         cwd = os.path.realpath(os.getcwd())
         rel = os.path.relpath(os.path.commonprefix([self.root_dir, cwd]), cwd)
         return f"{rel}/{self.out_fname}"
@@ -105,7 +252,7 @@ allowfullscreen
 
 def _set_custom_iframe_renderers() -> None:
     pio.renderers["iframe"] = MyIFrameRenderer(
-        config=pio._renderers.config, include_plotlyjs=True
+        config=pio._renderers.config, include_plotlyjs="shared"
     )
     pio.renderers["iframe_connected"] = MyIFrameRenderer(
         config=pio._renderers.config, include_plotlyjs="cdn"
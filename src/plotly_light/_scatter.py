@@ -4,6 +4,11 @@ from typing import Optional, Sequence, Tuple, Union
 import numpy as np
 import plotly.graph_objects as go
 
+from . import default
+from ._downsample import downsample_indices
+from ._precision import Precision, quantize
+from ._trace import make_trace
+
 
 def scatter(
     x: Sequence,
@@ -35,6 +40,9 @@ def scatter(
     show_legend: bool = False,
     show_init: bool = True,
     use_webgl: bool = False,
+    downsample: Optional[str] = None,
+    downsample_width: Optional[int] = None,
+    precision: Precision = None,
 ) -> go.Scatter:
     """Create a simple Trace object of a scatter plot.
 
@@ -43,7 +51,7 @@ def scatter(
       @ y : Coordinates of data on y-axis.
 
     optional arguments:
-      @ text            : Texts for each data.
+      @ text            : Texts for each data, or a single text for all data.
       @ text_pos        : Specify positions of `text`.
                           Format is: "[top|middle|bottom] [left|center|right]".
       @ text_size       : Size of `text`.
@@ -72,9 +80,25 @@ def scatter(
       @ show_legend     : Show this trace in legend.
       @ show_init       : Show this trace initially.
       @ use_webgl       : Use WebGL instead of SVG for speed.
+      @ downsample      : Reduce the number of data points sent to the browser
+                          based on the plot width. Global extrema are always kept.
+                          Must be one of {None (default), "lttb", "minmax", "uniform"}.
+                            - "lttb"    : Largest-Triangle-Three-Buckets (for lines).
+                            - "minmax"  : First/last/min/max points in each pixel
+                                          column (keeps every spike).
+                            - "uniform" : Equally spaced points (for markers).
+      @ downsample_width : Width of the plot in px used for `downsample`.
+                           Default: `default.plot_size`.
+      @ precision       : Reduce the precision of the float coordinates to make
+                          the plot data smaller. Default: `default.precision`.
+                          Must be one of {None, "float32", "grid", <int>}.
+                            - "float32" : Downcast to float32.
+                            - "grid"    : Snap to a grid finer than the pixels
+                                          of the plot (`downsample_width` px).
+                            - <int>     : Round to the number of significant digits.
     """
     assert len(x) == len(y), "`x` and `y` must have same size"
-    if text is not None:
+    if text is not None and not isinstance(text, str):
         assert len(x) == len(text), "`text` must have same size as data"
     if col_bar_ticks is not None:
         assert isinstance(col, Sequence) and isinstance(
@@ -93,7 +117,25 @@ def scatter(
                 -np.inf if col_range[0] is None else col_range[1],
             ),
         )
-    return (go.Scattergl if use_webgl else go.Scatter)(
+    if downsample is not None:
+        indices = downsample_indices(
+            x,
+            y,
+            downsample,
+            default.plot_size if downsample_width is None else downsample_width,
+        )
+        if len(indices) < len(x):
+            x, y = np.asarray(x)[indices], np.asarray(y)[indices]
+            if text is not None and not isinstance(text, str):
+                text = np.asarray(text)[indices]
+            if col is not None and not isinstance(col, str):
+                col = np.asarray(col)[indices]
+    if precision is None:
+        precision = default.precision
+    x = quantize(x, precision, downsample_width)
+    y = quantize(y, precision, downsample_width)
+    return make_trace(
+        go.Scattergl if use_webgl else go.Scatter,
         x=x,
         y=y,
         text=text,
@@ -110,7 +152,7 @@ def scatter(
                 size=marker_size,
                 color=col,
                 colorbar=dict(
-                    title=col_bar_title,
+                    title=dict(text=col_bar_title),
                     tickmode=None if col_bar_ticks is None else "array",
                     tickvals=col_bar_ticks,
                     dtick=col_bar_dtick,
@@ -1,27 +1,235 @@
-from math import sqrt
-from typing import Dict, Optional, Sequence, Union
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
 
 import plotly.graph_objects as go
+from logzero import logger
 from plotly.basedatatypes import BaseTraceType
-from plotly.subplots import make_subplots
 
 from . import _layout as pll
 from . import default
+from ._const import PAPER_AXIS_ID
+from ._export import export_many
 from ._type import Traces
 
+# A panel of `figure_mult`/`show_mult`, or a function without arguments building it
+Panel = Union[
+    BaseTraceType, Dict, go.Figure, Callable[[], Union[BaseTraceType, Dict, go.Figure]]
+]
+
+
+def _arrange_shape_traces(fig: go.Figure) -> None:
+    """Add the invisible axes in paper coordinates used by traces of shapes
+    (see `rects_shape` and `lines_shape`), and draw the traces of shapes with
+    `layer="below"` first.
+    """
+    for trace in fig.data:
+        # Traces without cartesian axes (e.g. Pie, Table) have no `xaxis`/`yaxis`
+        if "xaxis" in trace and trace.xaxis == f"x{PAPER_AXIS_ID}":
+            fig.layout[f"xaxis{PAPER_AXIS_ID}"] = dict(
+                overlaying="x", range=(0, 1), visible=False, fixedrange=True
+            )
+        if "yaxis" in trace and trace.yaxis == f"y{PAPER_AXIS_ID}":
+            fig.layout[f"yaxis{PAPER_AXIS_ID}"] = dict(
+                overlaying="y", range=(0, 1), visible=False, fixedrange=True
+            )
+    is_below = [
+        isinstance(trace.meta, dict) and trace.meta.get("layer") == "below"
+        for trace in fig.data
+    ]
+    if any(is_below):
+        fig.data = [t for t, b in zip(fig.data, is_below) if b] + [
+            t for t, b in zip(fig.data, is_below) if not b
+        ]
+
+
+def _axis_id(idx: int) -> str:
+    """Suffix of the axes of the `idx`-th (0-indexed) subplot, e.g. "" for `xaxis`."""
+    return "" if idx == 0 else str(idx + 1)
+
+
+def _update_dict(d: Dict, update: Dict) -> None:
+    """Update a (nested) dict of properties recursively, as `go.Figure.update` does."""
+    for k, v in update.items():
+        if isinstance(v, dict) and isinstance(d.get(k), dict):
+            _update_dict(d[k], v)
+        else:
+            d[k] = v
+
+
+def _grid_layout(
+    n_row: int,
+    n_col: int,
+    row_heights: Optional[Sequence[float]],
+    col_widths: Optional[Sequence[float]],
+    horizontal_spacing: Optional[float],
+    vertical_spacing: Optional[float],
+    shared_xaxes: Union[bool, str],
+    shared_yaxes: Union[bool, str],
+    sub_titles: Optional[Sequence[Optional[str]]],
+) -> Dict:
+    """Layout dict of a grid of subplots, which is same as the layout made by
+    `plotly.subplots.make_subplots` (with the first row on top) but built without
+    any Layout object. The subplot at row `i` and column `j` (0-indexed) uses the
+    axes `[x|y]axis{i * n_col + j + 1}`.
+    """
+    if horizontal_spacing is None:
+        horizontal_spacing = 0.2 / n_col
+    if vertical_spacing is None:
+        vertical_spacing = (0.3 if sub_titles is None else 0.5) / n_row
+    for spacing, n, name in (
+        (horizontal_spacing, n_col, "horizontal"),
+        (vertical_spacing, n_row, "vertical"),
+    ):
+        assert 0 <= spacing <= 1, f"`{name}_spacing` must be in [0, 1]"
+        assert n <= 1 or spacing <= 1 / (
+            n - 1
+        ), f"`{name}_spacing` must be at most 1 / {n - 1} for {n} subplots"
+
+    # Same computation as `make_subplots` not to change floating point errors
+    if col_widths is None:
+        widths = [(1.0 - horizontal_spacing * (n_col - 1)) / n_col] * n_col
+    else:
+        assert len(col_widths) == n_col, f"`col_widths` must have {n_col} values"
+        widths = [
+            (1.0 - horizontal_spacing * (n_col - 1)) * (w / float(sum(col_widths)))
+            for w in col_widths
+        ]
+    # From the bottom row
+    if row_heights is None:
+        heights = [(1.0 - vertical_spacing * (n_row - 1)) / n_row] * n_row
+    else:
+        assert len(row_heights) == n_row, f"`row_heights` must have {n_row} values"
+        heights = [
+            (1.0 - vertical_spacing * (n_row - 1)) * (h / float(sum(row_heights)))
+            for h in reversed(row_heights)
+        ]
+    # Domains of each column (from left) and each row (from top). Values over 1 due to
+    # floating point errors are clipped (only in the axes for x, as `make_subplots` does)
+    x_domains, y_domains = [], []
+    for j in range(n_col):
+        x_s = sum(widths[:j]) + j * horizontal_spacing
+        x_domains.append([x_s, x_s + widths[j]])
+    for i in reversed(range(n_row)):
+        y_s = sum(heights[:i]) + i * vertical_spacing
+        y_domains.append([min(max(y_s, 0.0), 1.0), min(y_s + heights[i], 1.0)])
+
+    layout = {}
+    for i in range(n_row):
+        for j in range(n_col):
+            axis_id = _axis_id(i * n_col + j)
+            layout[f"xaxis{axis_id}"] = dict(
+                domain=[min(x, 1.0) for x in x_domains[j]], anchor=f"y{axis_id}"
+            )
+            layout[f"yaxis{axis_id}"] = dict(
+                domain=list(y_domains[i]), anchor=f"x{axis_id}"
+            )
+
+    # Shared axes match the axis of the bottom row (x) or the first column (y)
+    def match(axis: str, i: int, j: int, first: Tuple[int, int], hide: bool) -> None:
+        if (i, j) == first:
+            return
+        _axis = layout[f"{axis}axis{_axis_id(i * n_col + j)}"]
+        _axis["matches"] = f"{axis}{_axis_id(first[0] * n_col + first[1])}"
+        if hide:
+            _axis["showticklabels"] = False
+
+    for axis, shared in (("x", shared_xaxes), ("y", shared_yaxes)):
+        if shared is True:
+            shared = "columns" if axis == "x" else "rows"
+        assert shared in (
+            False,
+            "columns",
+            "rows",
+            "all",
+        ), f'`shared_{axis}axes` must be boolean or one of {{"columns", "rows", "all"}}'
+        for i in range(n_row):
+            for j in range(n_col):
+                if shared == "columns":
+                    match(axis, i, j, (n_row - 1, j), axis == "x")
+                elif shared == "rows":
+                    match(axis, i, j, (i, 0), axis == "y")
+                elif shared == "all":
+                    match(
+                        axis,
+                        i,
+                        j,
+                        (n_row - 1, 0),
+                        j > 0 if axis == "y" else i < n_row - 1,
+                    )
+
+    if sub_titles is not None:
+        layout["annotations"] = [
+            dict(
+                y=y_domains[idx // n_col][1],
+                xref="paper",
+                x=sum(x_domains[idx % n_col]) / 2.0,
+                yref="paper",
+                text=title,
+                showarrow=False,
+                font=dict(size=16),
+                xanchor="center",
+                yanchor="bottom",
+            )
+            for idx, title in enumerate(sub_titles)
+            if title
+        ]
+    return layout
+
+
+def _call(builder: Callable):
+    return builder()
+
+
+def _build_panels(
+    figs: Sequence[Panel],
+    n_workers: Optional[int],
+    use_processes: bool,
+    skip_failed: bool,
+) -> List[Union[BaseTraceType, Dict, go.Figure]]:
+    """Call the builders in `figs` in parallel and return the panels in the same order.
+    Failures are logged per panel, and raised together unless `skip_failed` is True.
+    """
+    idxs = [i for i, fig in enumerate(figs) if callable(fig)]
+    if len(idxs) == 0:
+        return list(figs)
+
+    Executor = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    with Executor(n_workers) as executor:
+        futures = [executor.submit(_call, figs[i]) for i in idxs]
+    panels = list(figs)
+    errors = []
+    for i, future in zip(idxs, futures):
+        error = future.exception()
+        if error is None:
+            panels[i] = future.result()
+            continue
+        logger.error(f"Failed to build panel {i}: {type(error).__name__}: {error}")
+        errors.append((i, error))
+        # An empty panel with the error as its title
+        panels[i] = go.Figure(
+            layout=pll.layout(title=f"{type(error).__name__}: {error}")
+        )
+    if len(errors) > 0 and not skip_failed:
+        raise RuntimeError(
+            f"Failed to build {len(errors)} panel(s): {[i for i, _ in errors]}"
+        ) from errors[0][1]
+    return panels
+
 
 def figure(
     traces: Optional[Traces] = None,
     layout: Optional[go.Layout] = None,
     autoscale_font_by: str = None,
 ) -> go.Figure:
-    fig = go.Figure(data=traces, layout=layout)
+    # Without validation, dicts of traces are converted into trace objects as they are
+    fig = go.Figure(data=traces, layout=layout, _validate=default.validate)
+    _arrange_shape_traces(fig)
     pll.autoscale_plot_font_sizes(fig.layout, by=autoscale_font_by)
     return fig
 
 
 def figure_mult(
-    figs: Sequence[Union[BaseTraceType, go.Figure]],
+    figs: Sequence[Panel],
     layout: Optional[go.Layout] = None,
     n_col: int = 2,
     row_heights: Optional[Sequence[float]] = None,
@@ -31,12 +239,17 @@ def figure_mult(
     shared_xaxes: Union[bool, str] = False,
     shared_yaxes: Union[bool, str] = False,
     autoscale_font_by: str = None,
+    n_workers: Optional[int] = None,
+    use_processes: bool = False,
+    skip_failed: bool = False,
 ) -> go.Figure:
     """Make a figure object with multiple sub-figures.
 
     positional arguments:
       @ figs : List of Trace or Figure objects. If an element is a Figure object,
-               its layout is used for that subplot.
+               its layout is used for that subplot. An element can also be a function
+               without arguments returning a Trace or Figure object (e.g.
+               `functools.partial(pl.hist, data)`), which is called in parallel.
 
     optional arguments:
       @ layout           : A layout object for the overall figure.
@@ -47,63 +260,122 @@ def figure_mult(
                          : Size of spaces between subplots. Must be in [0, 1].
                            Default: horizontal = 0.1 / #cols, vertical = 0.2 / #rows.
       @ shared_[x|y]axes : Must be boolean or one of {"columns", "rows", "all"}.
+      @ n_workers        : Number of threads/processes calling the functions in `figs`.
+                           Default: # of CPUs (+ 4 for threads).
+      @ use_processes    : If True, use processes instead of threads. The functions
+                           must be picklable (e.g. not lambdas).
+      @ skip_failed      : If True, leave panels whose functions failed empty instead
+                           of raising an error. The errors are logged anyway.
     """
-    N = len(figs)
-    n_row = N // n_col + (0 if N % n_col == 0 else 1)
+    figs = _build_panels(figs, n_workers, use_processes, skip_failed)
 
     # Decompose Figure (or Trace) into Traces & Layout
+    trace_layout = pll.layout().to_plotly_json()
     sub_tracess, sub_layouts = zip(
         *[
             (
-                (fig.data, fig.layout)
+                (fig.data, fig.layout.to_plotly_json())
                 if isinstance(fig, go.Figure)
-                else ((fig,), pll.layout())
+                else ((fig,), trace_layout)
             )
             for fig in figs
         ]
     )
-    sub_titles = [l.title.text for l in sub_layouts]
+    return _assemble_mult(
+        sub_tracess,
+        sub_layouts,
+        layout,
+        n_col,
+        row_heights,
+        col_widths,
+        horizontal_spacing,
+        vertical_spacing,
+        shared_xaxes,
+        shared_yaxes,
+        autoscale_font_by,
+    )
+
+
+def _assemble_mult(
+    sub_tracess: Sequence[Sequence[Union[BaseTraceType, Dict]]],
+    sub_layouts: Sequence[Dict],
+    layout: Optional[go.Layout],
+    n_col: int,
+    row_heights: Optional[Sequence[float]],
+    col_widths: Optional[Sequence[float]],
+    horizontal_spacing: Optional[float],
+    vertical_spacing: Optional[float],
+    shared_xaxes: Union[bool, str],
+    shared_yaxes: Union[bool, str],
+    autoscale_font_by: Optional[str],
+) -> go.Figure:
+    """Body of `figure_mult` given the traces and the layout dict of each subplot."""
+    N = len(sub_tracess)
+    n_row = N // n_col + (0 if N % n_col == 0 else 1)
+    sub_titles = [l.get("title", {}).get("text") for l in sub_layouts]
     if all([x is None for x in sub_titles]):
         sub_titles = None
 
-    # Make entire figure, add each traces & layout, and add overall layout
-    fig = make_subplots(
-        rows=n_row,
-        cols=n_col,
-        row_heights=row_heights,
-        column_widths=col_widths,
-        shared_xaxes=shared_xaxes,
-        shared_yaxes=shared_yaxes,
-        horizontal_spacing=horizontal_spacing,
-        vertical_spacing=vertical_spacing,
-        subplot_titles=sub_titles,
+    # The data and the layout of the entire figure are built as dicts in one pass, and
+    # the figure is constructed at once, because updating a Figure object for each
+    # subplot takes time quadratic to the number of subplots.
+    fig_layout = _grid_layout(
+        n_row,
+        n_col,
+        row_heights,
+        col_widths,
+        horizontal_spacing,
+        vertical_spacing,
+        shared_xaxes,
+        shared_yaxes,
+        sub_titles,
     )
 
-    for i in range(n_row):
-        for j in range(1, n_col + 1):
-            if i * n_col + j > N:
-                continue
-            idx = i * n_col + j - 1
-            sub_traces = sub_tracess[idx]
-            for sub_trace in sub_traces:
-                fig.append_trace(sub_trace, row=i + 1, col=j)
-            l = sub_layouts[idx]
-            fig.update_xaxes(**l.xaxis.to_plotly_json(), row=i + 1, col=j)
-            fig.update_yaxes(**l.yaxis.to_plotly_json(), row=i + 1, col=j)
-
-            # Add images if exist
-            if "images" in l:
-                fig.layout.images = tuple(
-                    list(fig.layout.images)
-                    + list(
-                        map(
-                            lambda d: d.update(
-                                {"xref": f"x{idx + 1}", "yref": f"y{idx + 1}"}
-                            ),
-                            l.images,
-                        )
+    data = []
+    images = []
+    for idx, (sub_traces, l) in enumerate(zip(sub_tracess, sub_layouts)):
+        axis_id = _axis_id(idx)
+        # Invisible axes in the paper coordinates of this subplot for traces of
+        # shapes (see `_arrange_shape_traces`), after the axes of the grid
+        paper_id = _axis_id(n_row * n_col + idx)
+        for sub_trace in sub_traces:
+            if not isinstance(sub_trace, dict):
+                sub_trace = sub_trace.to_plotly_json()
+            sub_trace = dict(sub_trace)
+            for axis in ("x", "y"):
+                if sub_trace.get(f"{axis}axis") == f"{axis}{PAPER_AXIS_ID}":
+                    sub_trace[f"{axis}axis"] = f"{axis}{paper_id}"
+                    fig_layout[f"{axis}axis{paper_id}"] = dict(
+                        overlaying=f"{axis}{axis_id}",
+                        range=(0, 1),
+                        visible=False,
+                        fixedrange=True,
                     )
-                )
+                else:
+                    sub_trace[f"{axis}axis"] = f"{axis}{axis_id}"
+            data.append(sub_trace)
+        _update_dict(fig_layout[f"xaxis{axis_id}"], l.get("xaxis", {}))
+        _update_dict(fig_layout[f"yaxis{axis_id}"], l.get("yaxis", {}))
+
+        # Add images if exist
+        images += [
+            dict(image, xref=f"x{axis_id}", yref=f"y{axis_id}")
+            for image in l.get("images", [])
+        ]
+    if len(images) > 0:
+        fig_layout["images"] = images
+
+    # Traces of shapes with `layer="below"` are drawn first
+    is_below = [
+        isinstance(trace.get("meta"), dict) and trace["meta"].get("layer") == "below"
+        for trace in data
+    ]
+    if any(is_below):
+        data = [t for t, b in zip(data, is_below) if b] + [
+            t for t, b in zip(data, is_below) if not b
+        ]
+
+    fig = go.Figure(data=data, layout=fig_layout, _validate=default.validate)
     # fig.update_layout(margin=dict(t=70, l=40))
     fig.update_layout(layout)
     pll.autoscale_plot_font_sizes(fig.layout, by=autoscale_font_by)
@@ -117,7 +389,7 @@ def show(
     autoscale_font_by: str = None,
     out_image: Optional[str] = None,
     config: Optional[Dict] = None,
-    embed_plotlyjs: bool = False,
+    embed_plotlyjs: Union[bool, str] = False,
     return_fig: bool = False,
     no_plot: bool = False,
 ) -> None:
@@ -134,6 +406,8 @@ def show(
                            - `out.{svg,pdf,html}` for multiple outputs
                          .[png|jpeg|svg|pdf|eps|html] are supported.
       @ embed_plotlyjs : If True, embed plotly.js codes (~3 MB) in the output HTML file.
+                         If "shared", write plotly.js once into the directory of
+                         the HTML file (or `default.plotlyjs_dir`) and refer to it.
       @ no_plot        : If True, do not draw a plot in an interactive environment.
     """
     fig = (
@@ -149,30 +423,7 @@ def show(
 
     # Output image(s)
     if out_image is not None:
-        if out_image.endswith("}"):  # multiple output formats
-            data = out_image[:-1].split("{")
-            assert len(data) == 2, f"Invalid format: {out_image}"
-            prefix = data[0]
-            exts = data[1].split(",")
-            out_fnames = [f"{prefix}{ext}" for ext in exts]
-        else:  # single output formats
-            out_fnames = [out_image]
-
-        # scale factor to achieve the default dpi for the size of plot_inch
-        assert (
-            fig.layout.width is not None and fig.layout.height is not None
-        ), "width and height must be set to output images"
-        scale = sqrt(
-            ((default.dpi * default.plot_inch) ** 2)
-            / (fig.layout.width * fig.layout.height)
-        )
-        for out_fname in out_fnames:
-            if out_fname.endswith(".html"):
-                fig.write_html(
-                    file=out_fname, config=config, include_plotlyjs=embed_plotlyjs
-                )
-            else:
-                fig.write_image(out_fname, scale=scale)
+        export_many([fig], [out_image], config=config, embed_plotlyjs=embed_plotlyjs)
 
     if return_fig:
         return fig
@@ -182,7 +433,7 @@ def show(
 
 
 def show_mult(
-    figs: Sequence[Union[BaseTraceType, go.Figure]],
+    figs: Sequence[Panel],
     layout: Optional[go.Layout] = None,
     config: Optional[Dict] = None,
     n_col: int = 2,
@@ -194,15 +445,20 @@ def show_mult(
     shared_yaxes: Union[bool, str] = False,
     autoscale_font_by: str = None,
     out_image: Optional[str] = None,
-    embed_plotlyjs: bool = False,
+    embed_plotlyjs: Union[bool, str] = False,
     return_fig: bool = False,
     no_plot: bool = False,
+    n_workers: Optional[int] = None,
+    use_processes: bool = False,
+    skip_failed: bool = False,
 ) -> None:
     """Plot a figure with multiple subplots in Jupyter Notebook.
 
     positional arguments:
       @ figs : List of Trace or Figure objects. If an element is a Figure object,
-               its layout is used for that subplot.
+               its layout is used for that subplot. An element can also be a function
+               without arguments returning a Trace or Figure object (e.g.
+               `functools.partial(pl.hist, data)`), which is called in parallel.
 
     optional arguments:
       @ layout           : A layout object for the overall figure.
@@ -219,7 +475,12 @@ def show_mult(
                              - `out.{svg,pdf,html}` for multiple outputs
                            .[png|jpeg|svg|pdf|eps|html] are supported.
       @ embed_plotlyjs   : If True, embed plotly.js codes (~3 MB) in the output HTML file.
+                           If "shared", write plotly.js once into the directory of
+                           the HTML file (or `default.plotlyjs_dir`) and refer to it.
       @ no_plot        : If True, do not draw a plot in an interactive environment.
+      @ n_workers        : Number of threads/processes calling the functions in `figs`.
+      @ use_processes    : If True, use processes instead of threads.
+      @ skip_failed      : If True, leave panels whose functions failed empty.
     """
     fig = figure_mult(
         figs,
@@ -232,6 +493,9 @@ def show_mult(
         shared_xaxes=shared_xaxes,
         shared_yaxes=shared_yaxes,
         autoscale_font_by=autoscale_font_by,
+        n_workers=n_workers,
+        use_processes=use_processes,
+        skip_failed=skip_failed,
     )
 
     if return_fig:
@@ -0,0 +1,240 @@
+import threading
+from base64 import b64encode
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache, wraps
+from io import BytesIO
+from math import ceil, floor, log2
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import PIL.Image
+
+from . import default
+
+Box = Tuple[int, int, int, int]
+
+
+def _sized_cache(get_size: Callable[[], int]) -> Callable:
+    """Same as `lru_cache`, but the maximum size is `get_size()` at each call so that
+    a change of the setting (e.g. `default.image_cache_size`) takes effect.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        cache = OrderedDict()
+        lock = threading.Lock()
+
+        @wraps(func)
+        def wrapper(*args):
+            with lock:
+                if args in cache:
+                    cache.move_to_end(args)
+                    return cache[args]
+            value = func(*args)
+            with lock:
+                cache[args] = value
+                while len(cache) > max(get_size(), 0):
+                    cache.popitem(last=False)
+            return value
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator
+
+
+def _normalize_mode(img: PIL.Image.Image) -> PIL.Image.Image:
+    """Convert an image into one of the 8-bit modes {L, LA, RGB, RGBA}, which can be
+    downscaled and encoded in any format. E.g. palette (P), 1-bit (1) and 16-bit
+    (I;16) images cannot be downscaled by `reduce`.
+    """
+    if img.mode in ("L", "LA", "RGB", "RGBA"):
+        return img
+    if img.mode == "1":
+        return img.convert("L")
+    if img.mode.startswith("I;16"):
+        # Upper 8 bits, as browsers show 16-bit PNGs
+        arr = np.asarray(img).astype(np.uint16) >> 8
+        return PIL.Image.fromarray(arr.astype(np.uint8))
+    if img.mode in ("I", "F"):
+        arr = np.asarray(img, dtype=float)
+        vmin, vmax = np.nanmin(arr), np.nanmax(arr)
+        scale = 255 / (vmax - vmin) if vmax > vmin else 0
+        arr = np.nan_to_num((arr - vmin) * scale).clip(0, 255)
+        return PIL.Image.fromarray(arr.astype(np.uint8))
+    has_alpha = img.mode in ("P", "PA") or "A" in img.getbands()
+    return img.convert("RGBA" if has_alpha else "RGB")
+
+
+class _ImageSource:
+    """An image file from which a region can be read lazily at a lower resolution.
+    A `.npy` file (2D grayscale or 3D RGB[A] array) is memory-mapped, and only
+    the rows/columns needed at the resolution are read. Other files are opened by PIL
+    and decoded at each read (or once in `loaded()`), so that no decoded image is
+    kept in memory by the cache of `_open_image()`.
+    """
+
+    def __init__(self, fname: str) -> None:
+        self.fname = fname
+        self.arr, self.img = None, None
+        self._n_loaded = 0
+        self._lock = threading.Lock()
+        if fname.endswith(".npy"):
+            self.arr = np.load(fname, mmap_mode="r")
+            self.height, self.width = self.arr.shape[:2]
+            if self.arr.dtype != np.uint8:
+                # Color range estimated from a coarse grid of the data
+                step = max(1, max(self.height, self.width) // 1000)
+                sample = np.asarray(self.arr[::step, ::step], dtype=float)
+                self.vmin, self.vmax = np.nanmin(sample), np.nanmax(sample)
+        else:
+            # Only the header is read here
+            with PIL.Image.open(fname) as img:
+                self.width, self.height = img.size
+
+    def _decode(self) -> PIL.Image.Image:
+        with PIL.Image.open(self.fname) as img:
+            img.load()
+            return _normalize_mode(img)
+
+    @contextmanager
+    def loaded(self) -> Iterator[None]:
+        """Keep the decoded image during the block, e.g. while reading the tiles
+        of a view, instead of decoding it at each read.
+        """
+        if self.arr is not None:
+            yield
+            return
+        with self._lock:
+            if self._n_loaded == 0:
+                self.img = self._decode()
+            self._n_loaded += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._n_loaded -= 1
+                if self._n_loaded == 0:
+                    self.img = None
+
+    def read(self, box: Optional[Box] = None, factor: int = 1) -> PIL.Image.Image:
+        """Read the region `box` = (left, upper, right, lower) in px downscaled
+        by an integer `factor`. Entire image if `box` is None.
+        """
+        if box is None:
+            box = (0, 0, self.width, self.height)
+        if self.arr is None:
+            img = self.img
+            if img is None:
+                img = self._decode()
+            return img.reduce(factor, box=box)
+        left, upper, right, lower = box
+        arr = np.asarray(self.arr[upper:lower:factor, left:right:factor])
+        if arr.dtype != np.uint8:
+            scale = 255 / (self.vmax - self.vmin) if self.vmax > self.vmin else 0
+            arr = np.nan_to_num((arr - self.vmin) * scale).clip(0, 255)
+            arr = arr.astype(np.uint8)
+        return PIL.Image.fromarray(arr)
+
+
+@lru_cache(maxsize=8)
+def _open_image(fname: str, mtime: float) -> _ImageSource:
+    """Open an image file. `mtime` is only for the cache key."""
+    return _ImageSource(fname)
+
+
+def _to_data_uri(img: PIL.Image.Image, img_format: str, img_quality: int) -> str:
+    if img_format == "jpeg" and img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+    buf = BytesIO()
+    img.save(buf, format=img_format.upper(), quality=img_quality)
+    return f"data:image/{img_format};base64,{b64encode(buf.getvalue()).decode()}"
+
+
+@_sized_cache(lambda: default.image_cache_size * 16)
+def _encode_tile(
+    fname: str,
+    mtime: float,
+    factor: int,
+    tile_x: int,
+    tile_y: int,
+    tile_size: int,
+    img_format: str,
+    img_quality: int,
+) -> str:
+    """Encode a tile of an image file into a data URI. The tile is the region of
+    `tile_size` x `tile_size` px at the (`tile_x`, `tile_y`)-th position in the
+    image downscaled by `factor`.
+    """
+    src = _open_image(fname, mtime)
+    size = tile_size * factor
+    box = (
+        tile_x * size,
+        tile_y * size,
+        min((tile_x + 1) * size, src.width),
+        min((tile_y + 1) * size, src.height),
+    )
+    return _to_data_uri(src.read(box, factor), img_format, img_quality)
+
+
+def tile_images(
+    fname: str,
+    mtime: float,
+    window: Box,
+    target_size: Tuple[int, int],
+    coords: Tuple[float, float, float, float],
+    tile_size: int,
+    img_format: str,
+    img_quality: int,
+) -> List[Dict]:
+    """Make layout images of the tiles covering a region of an image file at the
+    display resolution.
+
+    positional arguments:
+      @ window      : Region (left, upper, right, lower) of the image in px.
+      @ target_size : Size (width, height) in px at which `window` is displayed.
+      @ coords      : Coordinates (xb, xe, yb, ye) of the entire image in the plot.
+      @ tile_size   : Width and height of each tile in px.
+    """
+    src = _open_image(fname, mtime)
+    left, upper, right, lower = window
+    left, upper = max(left, 0), max(upper, 0)
+    right, lower = min(right, src.width), min(lower, src.height)
+    if right <= left or lower <= upper:
+        return []
+    # Power-of-two downscaling factor, so that tiles are shared among zoom levels
+    scale = max((right - left) / target_size[0], (lower - upper) / target_size[1])
+    factor = 2 ** max(floor(log2(scale)), 0) if scale > 0 else 1
+    size = tile_size * factor
+
+    xb, xe, yb, ye = coords
+    sx, sy = (xe - xb) / src.width, (ye - yb) / src.height
+    images = []
+    # Decoded only once for all the tiles (not cached)
+    with src.loaded():
+        for tile_y in range(upper // size, ceil(lower / size)):
+            for tile_x in range(left // size, ceil(right / size)):
+                x0, y0 = tile_x * size, tile_y * size
+                x1, y1 = min(x0 + size, src.width), min(y0 + size, src.height)
+                images.append(
+                    dict(
+                        source=_encode_tile(
+                            fname,
+                            mtime,
+                            factor,
+                            tile_x,
+                            tile_y,
+                            tile_size,
+                            img_format,
+                            img_quality,
+                        ),
+                        xref="x",
+                        yref="y",
+                        x=xb + x0 * sx,
+                        y=ye - y0 * sy,
+                        sizex=(x1 - x0) * sx,
+                        sizey=-(y1 - y0) * sy,
+                        sizing="stretch",
+                    )
+                )
+    return images
@@ -0,0 +1,33 @@
+from typing import Any, Dict, Type, Union
+
+from plotly.basedatatypes import BaseTraceType
+
+from . import default
+
+
+def _drop_none(d: Dict[str, Any]) -> Dict[str, Any]:
+    """Remove properties of None (and empty dicts) recursively, as plotly's
+    constructors do.
+    """
+    ret = {}
+    for k, v in d.items():
+        if isinstance(v, dict):
+            v = _drop_none(v)
+            if len(v) == 0:
+                continue
+        if v is not None:
+            ret[k] = v
+    return ret
+
+
+def make_trace(
+    trace_type: Type[BaseTraceType], **kwargs: Any
+) -> Union[BaseTraceType, Dict]:
+    """Create a trace object of `trace_type` (e.g. `go.Scatter`) from properties.
+    If `default.validate` is False, return a plain dict of the trace instead, whose
+    properties (including every element of data arrays) are not validated.
+    Nested properties must be given as dicts (i.e. no "magic underscores").
+    """
+    if default.validate:
+        return trace_type(**kwargs)
+    return _drop_none(dict(type=trace_type.__name__.lower(), **kwargs))
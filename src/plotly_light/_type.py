@@ -1,4 +1,6 @@
-from typing import Union, List
+from typing import Dict, List, Union
+
 from plotly.basedatatypes import BaseTraceType
 
-Traces = Union[BaseTraceType, List[BaseTraceType]]
+# A trace is a trace object, or a plain dict of it if `default.validate` is False
+Traces = Union[BaseTraceType, Dict, List[Union[BaseTraceType, Dict]]]
@@ -8,6 +8,35 @@ renderer = pio.renderers.default
 dpi = 300
 plot_inch = 5
 
+# If not None, images output by `show(out_image=...)` and `export_many()` are cached in
+# this directory and reused for the same figure, scale and format. Least recently used
+# images are removed when the total size exceeds `export_cache_size` bytes.
+export_cache_dir = None
+export_cache_size = 1 << 30
+
+# Directory of plotly.js shared by HTML plots with `include_plotlyjs="shared"` (i.e. the
+# `iframe` renderer and `show(..., embed_plotlyjs="shared")`). If None, plotly.js is put
+# in the same directory as the HTML files. The directory must be accessible from the
+# HTML files with a relative path.
+plotlyjs_dir = None
+
+# If True, HTML files of plots drawn by the `iframe[_connected]` renderer are named
+# after hashes of the figures, and a figure identical to an existing one is not
+# written again (e.g. when a notebook is re-run).
+iframe_content_hash = False
+
+# If True, HTML files of plots drawn by the `iframe[_connected]` renderer are written in
+# `iframe_async_workers` background threads, and a plot is shown once its file is written.
+# Use `flush_html_writes()` to wait for them.
+iframe_async = False
+iframe_async_workers = 4
+
+# Default budget of `gc_htmls()` (also available as the `plotly-light-gc` command) for
+# HTML files of plots in `iframe_figures/`: maximum total size in bytes and maximum days
+# since the last access. No limit if None.
+iframe_gc_max_size = None
+iframe_gc_max_age = None
+
 # Base is "simple_white", but the color and some appearances are changed.
 theme = "simple_white"
 
@@ -25,6 +54,42 @@ bounding_line_width = 1
 zeroline_width = 1
 legend_border_width = 1
 
+# Number of points per pixel column kept by `scatter(..., downsample="lttb"|"uniform")`.
+# "minmax" keeps at most 4 (first, last, min, max) points per pixel column.
+downsample_points_per_px = 2
+
+# If not None, `rects_shape` and `lines_shape` return a single trace instead of layout
+# shapes when the number of shapes exceeds this value (and `as_trace` is not specified).
+shape_trace_threshold = None
+
+# Default precision of the coordinates of `scatter`, `lines`, `closures`, `rects` and
+# `hist` traces. None (keep as they are), "float32", "grid" or the number of significant
+# digits (see `precision` of `scatter`). With "grid", coordinates are snapped to a grid
+# of `precision_grid_per_px` points per pixel.
+precision = None
+precision_grid_per_px = 4
+
+# If False, the functions creating traces (e.g. `scatter`, `bar`, `hist`) return plain
+# dicts without validation, and `figure`/`show` build figures without validation.
+# This is much faster for large data. Set True to validate (e.g. for debugging).
+validate = True
+
+# If True, numerical arrays of traces in HTML files written by plotly_light (the
+# `iframe[_connected]` renderer and `show(out_image="*.html")`) are encoded as base64
+# typed arrays, which are smaller and faster to load than JSON number lists. Lists of
+# numbers are also encoded if they have at least `typed_array_min_list_size` elements.
+typed_arrays = True
+typed_array_min_list_size = 32
+
+# Images drawn by `image()` are downscaled to (plot size in px) * `image_dpr` and
+# encoded in `image_format` ("png", "jpeg" or "webp"; `image_quality` is for the
+# lossy formats). Encoded images are cached for the last `image_cache_size` calls
+# (no cache if 0).
+image_dpr = 2
+image_format = "png"
+image_quality = 90
+image_cache_size = 64
+
 margin = {"b": 10, "l": 10, "r": 10, "t": 100}
 
 colorway = [